@@ -0,0 +1,3 @@
+"""
+QBF Logic System
+"""
\ No newline at end of file
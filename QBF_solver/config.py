@@ -3,66 +3,134 @@ Configuration management for QBF Logic System
 """
 
 import os
+import functools
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Dict
+from dotenv import dotenv_values, find_dotenv
 
-# Load environment variables
-load_dotenv()
+# Keys _load_env copied from .env into os.environ (removed again by Config.invalidate_cache)
+_exported_keys = set()
+
+@functools.cache
+def _load_env() -> Dict[str, str]:
+    """Parse the .env file once; process environment variables take precedence
+    
+    Like load_dotenv, the .env entries are also exported to os.environ, for code
+    that reads it directly (e.g. NativeQBFSolver's DEPQBF_LIBRARY lookup).
+    """
+    for key, value in dotenv_values(find_dotenv()).items():
+        if value is not None and key not in os.environ:
+            os.environ[key] = value
+            _exported_keys.add(key)
+    return dict(os.environ)
+
+@functools.lru_cache(maxsize=None)
+def path_exists(path: Path) -> bool:
+    """Cached existence check, so each path is stat'd only once (until Config.invalidate_cache)"""
+    return path.exists()
+
+def _resolve_path(path: Path) -> str:
+    """Absolute string form of a path; falls back to the unresolved path on error"""
+    try:
+        return str(path.resolve())
+    except (OSError, RuntimeError):
+        return str(path)
+
+_DEFAULT_JAR = 'org.tweetyproject.logics.qbf-1.28-with-dependencies.jar'
+
+class _LazyEnv:
+    """Setting read from the environment on first access, then memoized on the class"""
+    
+    def __init__(self, env_name: str, default: str = None, caster=None):
+        self.env_name = env_name
+        self.default = default
+        self.caster = caster
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+        # Registered so Config.invalidate_cache can restore the descriptor after memoization
+        if '_lazy_settings' not in vars(owner):
+            owner._lazy_settings = {}
+        owner._lazy_settings[name] = self
+    
+    def __get__(self, instance, owner):
+        value = _load_env().get(self.env_name, self.default)
+        if self.caster is not None and value is not None:
+            value = self.caster(value)
+        # Replace the descriptor with the plain value so later lookups are direct
+        setattr(owner, self.name, value)
+        return value
 
 class Config:
     """Configuration settings"""
     
     # Project paths
     PROJECT_ROOT = Path(__file__).parent
-    JAR_PATH = PROJECT_ROOT / os.getenv('TWEETY_JAR_PATH', 'org.tweetyproject.logics.qbf-1.28-with-dependencies.jar')
+    JAR_PATH = _LazyEnv('TWEETY_JAR_PATH', _DEFAULT_JAR, lambda value: Config.PROJECT_ROOT / value)
+    # Absolute path string, resolved once and reused by every solver construction
+    JAR_PATH_STR = _LazyEnv('TWEETY_JAR_PATH', _DEFAULT_JAR, lambda value: _resolve_path(Config.PROJECT_ROOT / value))
     
     # API Configuration
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-    ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    OPENAI_API_KEY = _LazyEnv('OPENAI_API_KEY')
+    ANTHROPIC_API_KEY = _LazyEnv('ANTHROPIC_API_KEY')
+    GEMINI_API_KEY = _LazyEnv('GEMINI_API_KEY')
+    
+    # Provider name -> attribute holding its API key
+    _PROVIDER_KEYS = {
+        'openai': 'OPENAI_API_KEY',
+        'anthropic': 'ANTHROPIC_API_KEY',
+        'gemini': 'GEMINI_API_KEY',
+    }
     
     # LLM Provider settings
-    DEFAULT_LLM_PROVIDER = os.getenv('DEFAULT_LLM_PROVIDER', 'openai')
-    DEFAULT_MODEL = os.getenv('DEFAULT_MODEL', 'gpt-3.5-turbo')
+    DEFAULT_LLM_PROVIDER = _LazyEnv('DEFAULT_LLM_PROVIDER', 'openai')
+    DEFAULT_MODEL = _LazyEnv('DEFAULT_MODEL', 'gpt-3.5-turbo')
     
     # API Endpoints
     OPENAI_ENDPOINT = "https://api.openai.com/v1/chat/completions"
     ANTHROPIC_ENDPOINT = "https://api.anthropic.com/v1/messages"
     
     # Solver settings
-    SOLVER_TIMEOUT = int(os.getenv('SOLVER_TIMEOUT', '30'))
-    MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
+    SOLVER_TIMEOUT = _LazyEnv('SOLVER_TIMEOUT', '30', int)
+    MAX_RETRIES = _LazyEnv('MAX_RETRIES', '3', int)
     
     # Logging
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVEL = _LazyEnv('LOG_LEVEL', 'INFO')
+    
+    # Launcher: confirm Java runs with 'java -version', not just that it is on PATH
+    VERIFY_JAVA = _LazyEnv('QBF_VERIFY_JAVA', '0', lambda value: value == '1')
+    
+    # Cached result of validate_config
+    _validation_errors = None
     
     @classmethod
     def get_api_key(cls, provider: str = None) -> str:
         """Get API key for specified provider"""
         provider = provider or cls.DEFAULT_LLM_PROVIDER
         
-        if provider.lower() == 'openai':
-            return cls.OPENAI_API_KEY
-        elif provider.lower() == 'anthropic':
-            return cls.ANTHROPIC_API_KEY
-        elif provider.lower() == 'gemini':
-            return cls.GEMINI_API_KEY
-        else:
+        # Callers usually pass lowercase names; only normalize on a miss
+        attr = cls._PROVIDER_KEYS.get(provider) or cls._PROVIDER_KEYS.get(provider.lower())
+        if attr is None:
             raise ValueError(f"Unknown provider: {provider}")
+        return getattr(cls, attr)
     
     @classmethod
     def validate_config(cls) -> bool:
-        """Validate configuration"""
-        errors = []
-        
-        # Check JAR file
-        if not cls.JAR_PATH.exists():
-            errors.append(f"TweetyProject JAR not found: {cls.JAR_PATH}")
-        
-        # Check API keys
-        if not cls.get_api_key():
-            errors.append(f"No API key found for provider: {cls.DEFAULT_LLM_PROVIDER}")
+        """Validate configuration (checks run once, results are cached)"""
+        if cls._validation_errors is None:
+            errors = []
+            
+            # Check JAR file
+            if not path_exists(cls.JAR_PATH):
+                errors.append(f"TweetyProject JAR not found: {cls.JAR_PATH}")
+            
+            # Check API keys
+            if not cls.get_api_key():
+                errors.append(f"No API key found for provider: {cls.DEFAULT_LLM_PROVIDER}")
+            
+            cls._validation_errors = errors
         
+        errors = cls._validation_errors
         if errors:
             print("Configuration errors:")
             for error in errors:
@@ -70,6 +138,22 @@ class Config:
             return False
         
         return True
+    
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Forget cached settings and validation results (e.g. after creating the JAR or .env)
+        
+        The .env file is parsed again on the next setting access.
+        """
+        cls._validation_errors = None
+        path_exists.cache_clear()
+        _load_env.cache_clear()
+        for key in _exported_keys:
+            os.environ.pop(key, None)
+        _exported_keys.clear()
+        # Put back the descriptors that replaced themselves with their values
+        for name, setting in cls._lazy_settings.items():
+            setattr(cls, name, setting)
 
 # Validate on import
 if __name__ == "__main__":
@@ -3,85 +3,86 @@
 Simple QBF examples using the system
 """
 
+import argparse
+import functools
 import sys
-from pathlib import Path
+from typing import NamedTuple, Tuple
 
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
+from QBF_solver.qbf_system import QBFLogicSystem
+from QBF_solver.config import Config
 
-from qbf_system import QBFLogicSystem
-from config import Config
-
-def example_tautology():
-    """Example: Tautology"""
-    print("=== Example 1: Tautology ===")
-    print("Formula: ∀x (x ∨ ¬x)")
-    print("Expected: SATISFIABLE")
-    
-    system = QBFLogicSystem(
-        jar_path=str(Config.JAR_PATH),
+@functools.cache
+def _get_system() -> QBFLogicSystem:
+    """Build the QBF system once and share it across all examples"""
+    return QBFLogicSystem(
+        jar_path=Config.JAR_PATH_STR,
         llm_api_key=Config.get_api_key()
     )
-    
-    result = system.evaluate_qbf('x | ~x', ['x'], [('forall', 'x')])
-    print(f"Result: {result['result']}")
-    print(f"Time: {result['execution_time']:.4f}s")
-    return result['result'] == 'SATISFIABLE'
 
-def example_contradiction():
-    """Example: Contradiction"""
-    print("\n=== Example 2: Contradiction ===")
-    print("Formula: ∀x (x ∧ ¬x)")
-    print("Expected: UNSATISFIABLE")
-    
-    system = QBFLogicSystem(
-        jar_path=str(Config.JAR_PATH),
-        llm_api_key=Config.get_api_key()
-    )
-    
-    result = system.evaluate_qbf('x & ~x', ['x'], [('forall', 'x')])
-    print(f"Result: {result['result']}")
-    print(f"Time: {result['execution_time']:.4f}s")
-    return result['result'] == 'UNSATISFIABLE'
+class _Case(NamedTuple):
+    name: str
+    display: str
+    formula: str
+    variables: Tuple[str, ...]
+    quantifiers: Tuple[Tuple[str, str], ...]
+    expected: str
+
+# Deterministic examples, solved together in a single batch call
+CASES = (
+    _Case("Tautology", "∀x (x ∨ ¬x)", 'x | ~x', ('x',), (('forall', 'x'),), 'SATISFIABLE'),
+    _Case("Contradiction", "∀x (x ∧ ¬x)", 'x & ~x', ('x',), (('forall', 'x'),), 'UNSATISFIABLE'),
+    _Case("Existential", "∃x ∀y (x ∨ y)", 'x | y', ('x', 'y'), (('exists', 'x'), ('forall', 'y')), 'SATISFIABLE'),
+)
 
-def example_existential():
-    """Example: Existential"""
-    print("\n=== Example 3: Existential ===")
-    print("Formula: ∃x ∀y (x ∨ y)")
-    print("Expected: SATISFIABLE")
+@functools.cache
+def _deterministic_results(serial: bool = False) -> list:
+    """Evaluate all deterministic examples at once and cache their results
     
-    system = QBFLogicSystem(
-        jar_path=str(Config.JAR_PATH),
-        llm_api_key=Config.get_api_key()
+    With serial=True (--serial) they are evaluated one by one, which is easier to debug.
+    """
+    system = _get_system()
+    items = [(case.formula, case.variables, case.quantifiers) for case in CASES]
+    if serial:
+        return [system.evaluate_qbf(*item) for item in items]
+    return system.evaluate_qbf_batch(items)
+
+def _emit(*lines: str) -> None:
+    """Write a block of output lines with a single write call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _run_example(number: int, case: _Case, result: dict) -> bool:
+    """Print one deterministic example and check it against the expected result"""
+    separator = "" if number == 1 else "\n"
+    _emit(
+        f"{separator}=== Example {number}: {case.name} ===",
+        f"Formula: {case.display}",
+        f"Expected: {case.expected}",
+        f"Result: {result['result']}",
+        f"Time: {result['execution_time']:.4f}s",
     )
-    
-    result = system.evaluate_qbf('x | y', ['x', 'y'], [('exists', 'x'), ('forall', 'y')])
-    print(f"Result: {result['result']}")
-    print(f"Time: {result['execution_time']:.4f}s")
-    return result['result'] == 'SATISFIABLE'
+    return result['result'] == case.expected
 
 def example_natural_language():
-    """Example: Natural language"""
-    print("\n=== Example 4: Natural Language ===")
-    
+    """Example: Natural language (None when skipped for lack of an API key)"""
+    header = f"\n=== Example {len(CASES) + 1}: Natural Language ==="
     if not Config.get_api_key():
-        print("⚠️ No API key - skipping natural language example")
-        return True
+        _emit(header,
+              "⚠️ No API key - skipping natural language example")
+        return None
     
-    system = QBFLogicSystem(
-        jar_path=str(Config.JAR_PATH),
-        llm_api_key=Config.get_api_key()
-    )
+    system = _get_system()
     
     text = "Every proposition is either true or false"
-    print(f"Text: '{text}'")
+    _emit(header, f"Text: '{text}'")
     
     try:
         result = system.evaluate_text(text)
-        print(f"Generated QBF: {result['qbf_formula']}")
-        print(f"Variables: {result['variables']}")
-        print(f"Quantifiers: {result['quantifiers']}")
-        print(f"Result: {result['result']}")
+        _emit(
+            f"Generated QBF: {result['qbf_formula']}",
+            f"Variables: {result['variables']}",
+            f"Quantifiers: {result['quantifiers']}",
+            f"Result: {result['result']}",
+        )
         return True
     except Exception as e:
         print(f"❌ Natural language example failed: {e}")
@@ -89,23 +90,34 @@ def example_natural_language():
 
 def main():
     """Run all examples"""
+    parser = argparse.ArgumentParser(description="Run the simple QBF examples")
+    parser.add_argument("--serial", action="store_true", help="evaluate examples one at a time")
+    serial = parser.parse_args().serial
+    
     print("QBF Logic System - Simple Examples")
     print("=" * 40)
     
-    examples = [
-        ("Tautology", example_tautology),
-        ("Contradiction", example_contradiction),
-        ("Existential", example_existential),
-        ("Natural Language", example_natural_language)
-    ]
+    # Start the solver once, up front, instead of inside the first example;
+    # every example needs it, so there is nothing to run without it
+    try:
+        _get_system()
+    except Exception as e:
+        print(f"❌ System initialization failed: {e}")
+        return
     
     results = {}
-    for name, func in examples:
+    for number, case in enumerate(CASES, 1):
         try:
-            results[name] = func()
+            results[case.name] = _run_example(number, case, _deterministic_results(serial)[number - 1])
         except Exception as e:
-            print(f"❌ {name} failed: {e}")
-            results[name] = False
+            print(f"❌ {case.name} failed: {e}")
+            results[case.name] = False
+    
+    try:
+        results["Natural Language"] = example_natural_language()
+    except Exception as e:
+        print(f"❌ Natural Language failed: {e}")
+        results["Natural Language"] = False
     
     # Summary
     print("\n" + "=" * 40)
@@ -113,12 +125,14 @@ def main():
     print("=" * 40)
     
     for name, success in results.items():
-        status = "✅ PASS" if success else "❌ FAIL"
+        status = "⏭️ SKIPPED" if success is None else "✅ PASS" if success else "❌ FAIL"
         print(f"{name:20} {status}")
     
-    passed = sum(results.values())
+    # A skipped example counts as passed (it didn't fail), as before
+    skipped = sum(success is None for success in results.values())
+    passed = sum(success is not False for success in results.values())
     total = len(results)
-    print(f"\nTotal: {passed}/{total} examples passed")
+    print(f"\nTotal: {passed}/{total} examples passed" + (f" ({skipped} skipped)" if skipped else ""))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
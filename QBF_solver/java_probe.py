@@ -0,0 +1,30 @@
+"""
+Java availability probe shared by the launcher and the system tests
+"""
+
+import shutil
+import subprocess
+from typing import Optional, Tuple
+
+from config import Config
+
+def java_available(verify: Optional[bool] = None) -> Tuple[bool, str]:
+    """Locate java on PATH, optionally confirming it runs with 'java -version'
+
+    The JVM is only started when verify is true; by default that is the case
+    when QBF_VERIFY_JAVA=1 (environment or .env). Returns (available, path of the java executable).
+    """
+    path = shutil.which("java")
+    if path is None:
+        return False, ""
+
+    if verify is None:
+        verify = Config.VERIFY_JAVA
+    if not verify:
+        return True, path
+
+    try:
+        result = subprocess.run([path, "-version"], capture_output=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return False, path
+    return result.returncode == 0, path
@@ -5,15 +5,32 @@ Text to QBF conversion with LLM + TweetyProject QBF solving
 """
 
 import subprocess
-import tempfile
+import asyncio
 import logging
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Sequence, Optional
 from dataclasses import dataclass
 from enum import Enum
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 import shutil
+import hashlib
+import sqlite3
+import json
 import os
+import sys
+import re
+import math
+import threading
+import time
+import functools
+import ctypes
+import ctypes.util
+from collections import OrderedDict
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,14 +41,14 @@ class QBFResult(Enum):
     UNKNOWN = "UNKNOWN"
     ERROR = "ERROR"
 
-@dataclass
+@dataclass(slots=True)
 class QBFFormula:
     formula: str
     variables: List[str]
     quantifiers: List[Tuple[str, str]]
     description: str = None
 
-@dataclass
+@dataclass(slots=True)
 class QBFEvaluationResult:
     formula: QBFFormula
     result: QBFResult
@@ -39,13 +56,293 @@ class QBFEvaluationResult:
     solver_output: str
     error_message: str = None
 
+# Normalization tables used by DepQBFSolver._normalize_formula_syntax
+_SYMBOL_TABLE = str.maketrans({'~': '!', '¬': '!', '∧': '&', '∨': '|'})
+_RE_OPERATOR = re.compile(r'\s*(&&?|\|\|?|[!()])\s*')
+_RE_WS = re.compile(r'\s+')
+_OPERATOR_SPACING = {
+    '&': ' && ', '&&': ' && ',
+    '|': ' || ', '||': ' || ',
+    '!': '!', '(': '(', ')': ')',
+}
+
+def _space_operator(match: re.Match) -> str:
+    return _OPERATOR_SPACING[match.group(1)]
+
+def _normalize_formula(formula: str) -> str:
+    """'~'/'¬' become '!', '&'/'∧' and '|'/'∨' become '&&'/'||', operators get canonical spacing"""
+    normalized = formula.translate(_SYMBOL_TABLE)
+    normalized = _RE_OPERATOR.sub(_space_operator, normalized)
+    return _RE_WS.sub(' ', normalized).strip()
+
+# Variable names and operators of a normalized formula (see _normalize_formula_syntax)
+_TOKEN_RE = re.compile(r'\s*(?:([A-Za-z_]\w*)|(&&|\|\||[!()]))')
+
+def _tokenize_formula(formula: str) -> List[str]:
+    """Split a normalized formula into variable names and '!', '&&', '||', '(', ')'"""
+    tokens = []
+    pos, end = 0, len(formula.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(formula, pos)
+        if match is None:
+            raise ValueError(f"unexpected character {formula[pos:].lstrip()[:1]!r}")
+        name, operator = match.groups()
+        # Interned names compare by identity against the interned var_to_num keys
+        tokens.append(sys.intern(name) if name else operator)
+        pos = match.end()
+    return tokens
+
+def _parse_formula(tokens: List[str]) -> Tuple:
+    """Parse tokens into ('var', name) | ('not', node) | ('and'/'or', (nodes...)); ! > && > ||"""
+    node, pos = _parse_or(tokens, 0)
+    if pos != len(tokens):
+        raise ValueError(f"unexpected token {tokens[pos]!r}")
+    return node
+
+def _parse_or(tokens: List[str], pos: int) -> Tuple[Tuple, int]:
+    node, pos = _parse_and(tokens, pos)
+    operands = [node]
+    while pos < len(tokens) and tokens[pos] == '||':
+        node, pos = _parse_and(tokens, pos + 1)
+        operands.append(node)
+    return (operands[0] if len(operands) == 1 else ('or', tuple(operands))), pos
+
+def _parse_and(tokens: List[str], pos: int) -> Tuple[Tuple, int]:
+    node, pos = _parse_unary(tokens, pos)
+    operands = [node]
+    while pos < len(tokens) and tokens[pos] == '&&':
+        node, pos = _parse_unary(tokens, pos + 1)
+        operands.append(node)
+    return (operands[0] if len(operands) == 1 else ('and', tuple(operands))), pos
+
+def _parse_unary(tokens: List[str], pos: int) -> Tuple[Tuple, int]:
+    if pos >= len(tokens):
+        raise ValueError("unexpected end of formula")
+    token = tokens[pos]
+    if token == '!':
+        node, pos = _parse_unary(tokens, pos + 1)
+        return ('not', node), pos
+    if token == '(':
+        node, pos = _parse_or(tokens, pos + 1)
+        if pos >= len(tokens) or tokens[pos] != ')':
+            raise ValueError("missing closing parenthesis")
+        return node, pos + 1
+    if token in ('&&', '||', ')'):
+        raise ValueError(f"unexpected token {token!r}")
+    return ('var', token), pos + 1
+
+def _canonical_formula(formula_str: str, variables: Sequence[str],
+                       quantifiers: Sequence[Tuple[str, str]]) -> Optional[Tuple]:
+    """Cache key shared by equivalent spellings of a QBF, or None if the formula doesn't parse
+    
+    Quantified variables are renamed after their position in the prefix ('#0',
+    '#1', ..., which can't clash with real names), operands of &&/|| are
+    flattened, deduplicated and sorted, and double negations are dropped, so
+    "x | ~x", "~x || x" and "¬y ∨ y" with the same prefix share one key.
+    Free variables keep their names; formulas quantifying or using a variable
+    missing from `variables` are left to the solver's own handling (None).
+    """
+    try:
+        ast = _parse_formula(_tokenize_formula(_normalize_formula(formula_str)))
+    except ValueError:
+        return None
+    
+    known = set(variables)
+    renamed = {}
+    for position, (_, var) in enumerate(quantifiers):
+        if var not in known:
+            return None
+        renamed.setdefault(var, f"#{position}")
+    free = set()
+    
+    def emit(node: Tuple) -> str:
+        kind = node[0]
+        if kind == 'var':
+            name = node[1]
+            if name not in known:
+                raise KeyError(name)
+            if name not in renamed:
+                free.add(name)
+            return renamed.get(name, name)
+        if kind == 'not':
+            operand = node[1]
+            return emit(operand[1]) if operand[0] == 'not' else '!' + emit(operand)
+        operands = set()
+        stack = list(node[1])
+        while stack:
+            operand = stack.pop()
+            if operand[0] == kind:
+                stack.extend(operand[1])
+            else:
+                operands.add(emit(operand))
+        if len(operands) == 1:
+            return operands.pop()
+        return '(' + (' && ' if kind == 'and' else ' || ').join(sorted(operands)) + ')'
+    
+    try:
+        text = emit(ast)
+    except KeyError:
+        return None
+    return (text, tuple(sorted(free)), tuple((quant_type, renamed[var]) for quant_type, var in quantifiers))
+
+# Formulas with at most this many variables are decided in-process (truth tables of 2^n bits)
+SMALL_QBF_VARIABLES = 16
+
+@functools.lru_cache(maxsize=None)
+def _variable_columns(num_vars: int) -> Tuple[int, ...]:
+    """Truth-table columns as int bitsets: bit i of column k is bit k of assignment number i"""
+    size = 1 << num_vars
+    full = (1 << size) - 1
+    columns = []
+    for k in range(num_vars):
+        width = 1 << k
+        # 2^k zeros then 2^k ones, repeated over the whole table
+        block = ((1 << width) - 1) << width
+        columns.append(block * (full // ((1 << (2 * width)) - 1)))
+    return tuple(columns)
+
+def _truth_table(node: Tuple, columns: Dict[str, int], full: int) -> int:
+    """The matrix evaluated under every assignment at once, one bit per assignment"""
+    kind = node[0]
+    if kind == 'var':
+        return columns[node[1]]
+    if kind == 'not':
+        return full ^ _truth_table(node[1], columns, full)
+    tables = [_truth_table(operand, columns, full) for operand in node[1]]
+    result = tables[0]
+    if kind == 'and':
+        for table in tables[1:]:
+            result &= table
+    else:
+        for table in tables[1:]:
+            result |= table
+    return result
+
+def _decide_small_qbf(formula: QBFFormula) -> Optional[QBFResult]:
+    """Verdict of a closed QBF over few variables from its truth table, or None
+    
+    None means "ask a solver": the formula doesn't parse, has free, undeclared
+    or repeatedly quantified variables, or has more than SMALL_QBF_VARIABLES.
+    """
+    try:
+        ast = _parse_formula(_tokenize_formula(_normalize_formula(formula.formula)))
+    except ValueError:
+        return None
+    
+    occurring = set()
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if node[0] == 'var':
+            occurring.add(node[1])
+        elif node[0] == 'not':
+            stack.append(node[1])
+        else:
+            stack.extend(node[1])
+    
+    quantified_vars = [var for _, var in formula.quantifiers]
+    if len(set(quantified_vars)) != len(quantified_vars) or not occurring.issubset(quantified_vars):
+        return None
+    # DepQBF rejects variables missing from the variable list; leave that error to it
+    if not occurring.issubset(formula.variables):
+        return None
+    # Quantifiers over variables that don't occur in the matrix don't change its value
+    prefix = [(quant_type, var) for quant_type, var in formula.quantifiers if var in occurring]
+    if len(prefix) > SMALL_QBF_VARIABLES:
+        return None
+    
+    # The outermost variable owns the lowest assignment bit, so the innermost one is
+    # eliminated first by folding the upper half of the table onto the lower half
+    num_vars = len(prefix)
+    full = (1 << (1 << num_vars)) - 1
+    columns = dict(zip((var for _, var in prefix), _variable_columns(num_vars)))
+    table = _truth_table(ast, columns, full)
+    for quant_type, _ in reversed(prefix):
+        num_vars -= 1
+        half = 1 << num_vars
+        low, high = table & ((1 << half) - 1), table >> half
+        table = low & high if quant_type == 'forall' else low | high
+    return QBFResult.SATISFIABLE if table else QBFResult.UNSATISFIABLE
+
+class BloqqerPreprocessor:
+    """Simplifies QDIMACS with Bloqqer before it reaches DepQBF"""
+    
+    # Maximum number of preprocessed instances kept in memory
+    CACHE_SIZE = 1024
+    
+    def __init__(self, bloqqer_path: str):
+        self.bloqqer_path = bloqqer_path
+        self._cache: Dict[str, Tuple[Optional[QBFResult], str]] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def find(cls) -> Optional["BloqqerPreprocessor"]:
+        """A preprocessor using the bloqqer found in PATH, or None if it isn't installed"""
+        bloqqer_path = shutil.which("bloqqer")
+        if bloqqer_path:
+            logger.info(f"Found Bloqqer at: {bloqqer_path}")
+            return cls(bloqqer_path)
+        return None
+    
+    def preprocess(self, qdimacs: str) -> Tuple[Optional[QBFResult], str]:
+        """Return (verdict, QDIMACS); the verdict is set when Bloqqer already solved the formula
+        
+        On any Bloqqer failure the input is returned unchanged.
+        """
+        key = hashlib.sha256(qdimacs.encode()).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            result = subprocess.run([self.bloqqer_path, "--keep=0"], input=qdimacs,
+                                    capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Bloqqer failed: {e}")
+            return None, qdimacs
+        
+        # Bloqqer uses the solver exit codes: 10 SAT, 20 UNSAT, 0 simplified only
+        if result.returncode == 10:
+            preprocessed = (QBFResult.SATISFIABLE, qdimacs)
+        elif result.returncode == 20:
+            preprocessed = (QBFResult.UNSATISFIABLE, qdimacs)
+        elif result.returncode == 0 and result.stdout.strip():
+            preprocessed = (None, result.stdout)
+        else:
+            logger.warning(f"Bloqqer exited with code {result.returncode}: {result.stderr.strip()}")
+            return None, qdimacs
+        
+        with self._lock:
+            if len(self._cache) >= self.CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = preprocessed
+        return preprocessed
+
 class DepQBFSolver:
     """Dedicated QBF solver using DepQBF"""
     
-    def __init__(self):
+    # Maximum number of memoized (sub-)formula CNF conversions
+    CNF_CACHE_SIZE = 4096
+    # Maximum number of QDIMACS texts kept for repeated formulas (least recently used go first)
+    QDIMACS_CACHE_SIZE = 1024
+    # Disjunctions whose distributive expansion would exceed this many clauses are Tseitin-encoded
+    TSEITIN_THRESHOLD = 64
+    
+    def __init__(self, use_preprocessor: bool = True):
+        self._cnf_cache: Dict[Tuple, Tuple[Tuple[int, ...], ...]] = {}
+        self._qdimacs_cache: OrderedDict[Tuple, str] = OrderedDict()
+        # Guards both caches; evaluate_qbf_batch converts formulas from several threads
+        self._cache_lock = threading.Lock()
+        # DepQBF processes still running, by id() of the formula they solve (see cancel)
+        self._running: Dict[int, set] = {}
+        self._running_lock = threading.Lock()
         self.depqbf_path = self._find_or_install_depqbf()
         if not self.depqbf_path:
             raise RuntimeError("DepQBF solver not available")
+        # Optional: only used when bloqqer is installed
+        self.preprocessor = BloqqerPreprocessor.find() if use_preprocessor else None
     
     def _find_or_install_depqbf(self) -> str:
         """Find or install DepQBF solver"""
@@ -121,332 +418,287 @@ class DepQBFSolver:
     
     def evaluate_qbf(self, formula: QBFFormula) -> QBFEvaluationResult:
         """Evaluate QBF using DepQBF solver"""
-        import time
         start_time = time.time()
         
         try:
             # Convert to QDIMACS format
-            qdimacs_content = self._to_qdimacs(formula)
+            qdimacs_content, verdict = self._encode(formula)
+        except Exception as e:
+            return self._error_result(formula, time.time() - start_time, str(e))
+        
+        if verdict is not None:
+            # Simplification already decided the formula; no need to start DepQBF
+            return QBFEvaluationResult(
+                formula=formula,
+                result=verdict,
+                execution_time=time.time() - start_time,
+                solver_output="Decided by CNF simplification",
+                error_message=None
+            )
+        
+        return self._solve_qdimacs(qdimacs_content, formula, start_time)
+    
+    def _solve_qdimacs(self, qdimacs_content: str, formula: QBFFormula, start_time: float) -> QBFEvaluationResult:
+        try:
+            if self.preprocessor is not None:
+                verdict, qdimacs_content = self.preprocessor.preprocess(qdimacs_content)
+                if verdict is not None:
+                    return QBFEvaluationResult(
+                        formula=formula,
+                        result=verdict,
+                        execution_time=time.time() - start_time,
+                        solver_output="Decided by Bloqqer preprocessing",
+                        error_message=None
+                    )
             
-            # Write to temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.qdimacs', delete=False) as f:
-                f.write(qdimacs_content)
-                temp_file = f.name
+            qbf_result, solver_output, error_message = self._run_depqbf(qdimacs_content, formula)
             
-            try:
-                # Run DepQBF
-                cmd = [self.depqbf_path, temp_file]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-                
-                execution_time = time.time() - start_time
-                
-                # Parse result
-                qbf_result = self._parse_depqbf_output(result.stdout, result.stderr, result.returncode)
-                
-                return QBFEvaluationResult(
-                    formula=formula,
-                    result=qbf_result,
-                    execution_time=execution_time,
-                    solver_output=f"STDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}",
-                    error_message=result.stderr if result.returncode != 0 else None
-                )
-                
-            finally:
-                # Clean up temp file
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
-                    
-        except Exception as e:
             return QBFEvaluationResult(
                 formula=formula,
-                result=QBFResult.ERROR,
+                result=qbf_result,
                 execution_time=time.time() - start_time,
-                solver_output="",
-                error_message=str(e)
+                solver_output=solver_output,
+                error_message=error_message
             )
+                    
+        except Exception as e:
+            return self._error_result(formula, time.time() - start_time, str(e))
+    
+    def _run_depqbf(self, qdimacs_content: str,
+                    formula: Optional[QBFFormula] = None) -> Tuple[QBFResult, str, Optional[str]]:
+        """Solve QDIMACS text; returns (result, solver output, error message)
+        
+        The process is registered under `formula` while it runs, so cancel() can kill it.
+        """
+        # Run DepQBF; without a file argument it reads the formula from stdin
+        cmd = [self.depqbf_path]
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, text=True)
+        key = id(formula)
+        with self._running_lock:
+            self._running.setdefault(key, set()).add(process)
+        try:
+            stdout, stderr = process.communicate(qdimacs_content, timeout=60)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            with self._running_lock:
+                running = self._running[key]
+                running.discard(process)
+                if not running:
+                    del self._running[key]
+        
+        # Parse result
+        qbf_result = self._parse_depqbf_output(stdout, stderr, process.returncode)
+        
+        return (qbf_result, f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}",
+                stderr if process.returncode != 0 else None)
+    
+    def cancel(self, formula: QBFFormula):
+        """Kill the DepQBF processes still solving `formula` (their results are no longer needed)"""
+        with self._running_lock:
+            processes = list(self._running.get(id(formula), ()))
+        for process in processes:
+            process.kill()
+    
+    def _error_result(self, formula: Optional[QBFFormula], exec_time: float, error: str) -> QBFEvaluationResult:
+        return QBFEvaluationResult(formula, QBFResult.ERROR, exec_time, "", error)
+    
+    def evaluate_qbf_batch(self, formulas: List[QBFFormula], max_workers: int = None) -> List[QBFEvaluationResult]:
+        """Evaluate several QBFs; each runs in its own DepQBF process, concurrently
+        
+        max_workers caps the number of simultaneous DepQBF processes (default: one per CPU).
+        """
+        max_workers = min(len(formulas), max_workers or os.cpu_count() or 1)
+        if max_workers <= 1:
+            return [self.evaluate_qbf(formula) for formula in formulas]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.evaluate_qbf, formulas))
     
-    def _to_qdimacs(self, formula: QBFFormula) -> str:
-        """Convert QBF formula to QDIMACS format"""
+    def _encode(self, formula: QBFFormula) -> Tuple[str, Optional[QBFResult]]:
+        """QDIMACS text of a formula plus its verdict when simplification already decides it
         
+        Results are reused for recently seen formulas.
+        """
+        key = (formula.formula, tuple(formula.variables), tuple(tuple(q) for q in formula.quantifiers))
+        with self._cache_lock:
+            encoded = self._qdimacs_cache.get(key)
+            if encoded is not None:
+                self._qdimacs_cache.move_to_end(key)
+                return encoded
+        
+        encoded = self._build_qdimacs(formula)
+        with self._cache_lock:
+            self._qdimacs_cache[key] = encoded
+            if len(self._qdimacs_cache) > self.QDIMACS_CACHE_SIZE:
+                self._qdimacs_cache.popitem(last=False)
+        return encoded
+    
+    def _build_qdimacs(self, formula: QBFFormula) -> Tuple[str, Optional[QBFResult]]:
         # Create variable mapping
-        var_to_num = {var: i+1 for i, var in enumerate(formula.variables)}
+        var_to_num = {sys.intern(var): i+1 for i, var in enumerate(formula.variables)}
         num_vars = len(formula.variables)
         
-        # Convert formula to CNF clauses
-        cnf_clauses = self._formula_to_cnf(formula.formula, var_to_num)
+        # Convert formula to CNF clauses (may introduce Tseitin auxiliary variables)
+        cnf_clauses, num_aux = self._formula_to_cnf(formula.formula, var_to_num)
+        
+        # Auxiliary variables are functionally defined by the original ones,
+        # so they are quantified existentially in the innermost block
+        quantified = [(quant_type, var_to_num[var]) for quant_type, var in formula.quantifiers]
+        quantified.extend(('exists', num_vars + i + 1) for i in range(num_aux))
+        num_vars += num_aux
+        
+        cnf_clauses = self._simplify_clauses(cnf_clauses, quantified)
         num_clauses = len(cnf_clauses)
+        if not cnf_clauses:
+            verdict = QBFResult.SATISFIABLE
+        elif any(not clause for clause in cnf_clauses):
+            verdict = QBFResult.UNSATISFIABLE
+        else:
+            verdict = None
+        
+        # Text of every literal, formatted once instead of per occurrence
+        # (the tautology fallback of _formula_to_cnf always uses variable 1)
+        bound = max(num_vars, 1)
+        literal_text = {lit: str(lit) for lit in range(-bound, bound + 1)}
+        to_text = literal_text.__getitem__
         
         # Build QDIMACS
         lines = []
         lines.append(f"p cnf {num_vars} {num_clauses}")
         
-        # Add quantifiers
-        current_quantifier = None
-        current_vars = []
-        
-        for quant_type, var in formula.quantifiers:
-            var_num = var_to_num[var]
-            
-            if quant_type != current_quantifier:
-                # Output previous quantifier block
-                if current_quantifier and current_vars:
-                    quant_symbol = "e" if current_quantifier == "exists" else "a"
-                    vars_str = " ".join(map(str, current_vars))
-                    lines.append(f"{quant_symbol} {vars_str} 0")
-                
-                # Start new quantifier block
-                current_quantifier = quant_type
-                current_vars = [var_num]
-            else:
-                current_vars.append(var_num)
-        
-        # Output final quantifier block
-        if current_quantifier and current_vars:
-            quant_symbol = "e" if current_quantifier == "exists" else "a"
-            vars_str = " ".join(map(str, current_vars))
+        # Add quantifiers, one block per run of consecutive same-type quantifiers
+        for quant_type, block in groupby(quantified, key=itemgetter(0)):
+            quant_symbol = "e" if quant_type == "exists" else "a"
+            vars_str = " ".join(to_text(var_num) for _, var_num in block)
             lines.append(f"{quant_symbol} {vars_str} 0")
         
         # Add clauses
-        for clause in cnf_clauses:
-            clause_str = " ".join(map(str, clause)) + " 0"
-            lines.append(clause_str)
-        
-        return "\n".join(lines)
-    
-    def _formula_to_cnf(self, formula: str, var_to_num: Dict[str, int]) -> List[List[int]]:
-        """Convert propositional formula to CNF clauses - FIXED ORDER"""
-        
-        # Handle simple cases first
-        original_formula = formula.strip()
-        print(f"DEBUG CNF: Original formula: '{original_formula}'")
-        
-        # Normalize formula syntax first - ALWAYS
-        formula = self._normalize_formula_syntax(original_formula)
-        print(f"DEBUG CNF: Normalized formula: '{formula}'")
-        
-        # Simple literal
-        if formula in var_to_num:
-            print(f"DEBUG CNF: Simple literal '{formula}' -> {[[var_to_num[formula]]]}")
-            return [[var_to_num[formula]]]
-        
-        # Negated literal  
-        if formula.startswith('!') and formula[1:] in var_to_num:
-            print(f"DEBUG CNF: Negated literal '{formula}' -> {[[-var_to_num[formula[1:]]]]}")
-            return [[-var_to_num[formula[1:]]]]
-        
-        # CRITICAL FIX: Handle || BEFORE && to preserve parentheses structure
-        # Handle x || y pattern (OR creates single clause with multiple literals)
-        if ' || ' in formula:
-            parts = formula.split(' || ')
-            print(f"DEBUG CNF: Split on ' || ': {parts}")
-            
-            # Check if this is a complex OR with parentheses - handle with distributive law
-            has_complex_parts = any(part.strip().startswith('(') and part.strip().endswith(')') for part in parts)
-            print(f"DEBUG CNF: Has complex parts with parentheses: {has_complex_parts}")
-            
-            if has_complex_parts:
-                # For complex OR like (x && !y) || (!x && y), use distributive conversion
-                print(f"DEBUG CNF: Using complex OR conversion (distributive law)")
-                return self._convert_complex_or_to_cnf(parts, var_to_num)
-            else:
-                # Simple OR - just combine literals
-                print(f"DEBUG CNF: Processing simple OR")
-                clause = []
-                for i, part in enumerate(parts):
-                    part = part.strip()
-                    print(f"DEBUG CNF: Processing OR part {i+1}: '{part}'")
-                    if part in var_to_num:
-                        clause.append(var_to_num[part])
-                        print(f"DEBUG CNF: Added positive literal: {var_to_num[part]}")
-                    elif part.startswith('!') and part[1:] in var_to_num:
-                        clause.append(-var_to_num[part[1:]])
-                        print(f"DEBUG CNF: Added negative literal: {-var_to_num[part[1:]]}")
-                    else:
-                        # Try to parse recursively for simple cases
-                        print(f"DEBUG CNF: Trying recursive parse for: '{part}'")
-                        sub_cnf = self._formula_to_cnf(part, var_to_num)
-                        if len(sub_cnf) == 1 and len(sub_cnf[0]) == 1:
-                            clause.append(sub_cnf[0][0])
-                            print(f"DEBUG CNF: Added from recursive parse: {sub_cnf[0][0]}")
-                        else:
-                            logger.warning(f"Complex part in simple OR: {part}")
-                            print(f"DEBUG CNF: Failed to parse '{part}', using tautology fallback")
-                            return [[1, -1]]  # fallback
-                print(f"DEBUG CNF: Final OR clause: {clause}")
-                return [clause] if clause else [[1, -1]]
-
-        # Handle x && !y pattern (AND creates multiple clauses) - AFTER checking for ||
-        if ' && ' in formula:
-            parts = formula.split(' && ')
-            print(f"DEBUG CNF: Split on ' && ': {parts}")
-            clauses = []
-            for i, part in enumerate(parts):
-                part = part.strip()
-                print(f"DEBUG CNF: Processing AND part {i+1}: '{part}'")
-                if part in var_to_num:
-                    clauses.append([var_to_num[part]])
-                    print(f"DEBUG CNF: Simple var '{part}' -> clause {[var_to_num[part]]}")
-                elif part.startswith('!') and part[1:] in var_to_num:
-                    clauses.append([-var_to_num[part[1:]]])
-                    print(f"DEBUG CNF: Negated var '{part}' -> clause {[-var_to_num[part[1:]]]}")
-                else:
-                    # Handle more complex sub-expressions recursively
-                    print(f"DEBUG CNF: Recursively processing complex part: '{part}'")
-                    sub_clauses = self._formula_to_cnf(part, var_to_num)
-                    clauses.extend(sub_clauses)
-                    print(f"DEBUG CNF: Sub-clauses: {sub_clauses}")
-            print(f"DEBUG CNF: Final AND clauses: {clauses}")
-            return clauses
-
-        # Handle parentheses - AFTER checking for operators
-        if formula.startswith('(') and formula.endswith(')'):
-            print(f"DEBUG CNF: Removing outer parentheses from: '{formula}'")
-            # Check if these are balanced outer parentheses
-            inner = formula[1:-1].strip()
-            paren_count = 0
-            for char in inner:
-                if char == '(':
-                    paren_count += 1
-                elif char == ')':
-                    paren_count -= 1
-                    if paren_count < 0:
-                        break
-            
-            if paren_count == 0:  # Balanced, safe to remove outer parens
-                print(f"DEBUG CNF: Inner formula after removing parens: '{inner}'")
-                return self._formula_to_cnf(inner, var_to_num)
-            else:
-                print(f"DEBUG CNF: Unbalanced parentheses, keeping as-is")
+        lines.extend(" ".join(map(to_text, clause)) + " 0" if clause else "0" for clause in cnf_clauses)
         
-        # Single variable fallback
-        if formula in var_to_num:
-            print(f"DEBUG CNF: Final fallback - single variable '{formula}' -> {[[var_to_num[formula]]]}")
-            return [[var_to_num[formula]]]
-        
-        # Fallback: create a tautology
-        logger.warning(f"Unknown formula pattern: {formula}, creating tautology")
-        print(f"DEBUG CNF: UNKNOWN PATTERN '{formula}' - using tautology fallback [[1, -1]]")
-        return [[1, -1]]  # Always true
-
-    def _convert_complex_or_to_cnf(self, parts: List[str], var_to_num: Dict[str, int]) -> List[List[int]]:
-        """Convert complex OR with parentheses to CNF using distributive law"""
+        return "\n".join(lines), verdict
+    
+    @staticmethod
+    def _simplify_clauses(clauses: List[List[int]], quantified: List[Tuple[str, int]]) -> List[List[int]]:
+        """Drop tautological clauses and duplicate literals, then apply universal reduction
         
-        print(f"DEBUG COMPLEX OR: Input parts: {parts}")
+        A universal literal is removed from a clause when no existential literal of
+        that clause is quantified inside it; unquantified variables count as
+        outermost existentials. An empty result clause makes the QBF false.
+        """
+        depth = {}
+        universal = set()
+        for level, (quant_type, var_num) in enumerate(quantified, 1):
+            depth[var_num] = level
+            if quant_type != "exists":
+                universal.add(var_num)
+        
+        simplified = []
+        for clause in clauses:
+            literals = dict.fromkeys(clause)
+            if any(-lit in literals for lit in literals):
+                continue
+            innermost_existential = max((depth.get(abs(lit), 0) for lit in literals
+                                         if abs(lit) not in universal), default=-1)
+            simplified.append([lit for lit in literals
+                               if abs(lit) not in universal or depth[abs(lit)] < innermost_existential])
+        return simplified
+    
+    def _formula_to_cnf(self, formula: str, var_to_num: Dict[str, int]) -> Tuple[List[List[int]], int]:
+        """Convert propositional formula to CNF clauses, memoized per (sub-)formula
         
-        cnf_parts = []
+        Returns the clauses and the number of auxiliary variables they use;
+        auxiliary variables are numbered after the ones in var_to_num.
+        """
+        key = (formula.strip(), tuple(var_to_num.items()))
+        cached = self._cnf_cache.get(key)
+        if cached is None:
+            clauses, num_aux = self._formula_to_cnf_uncached(formula, var_to_num)
+            cached = (tuple(tuple(clause) for clause in clauses), num_aux)
+            with self._cache_lock:
+                if len(self._cnf_cache) >= self.CNF_CACHE_SIZE:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    del self._cnf_cache[next(iter(self._cnf_cache))]
+                self._cnf_cache[key] = cached
+        clauses, num_aux = cached
+        return [list(clause) for clause in clauses], num_aux
+    
+    def _formula_to_cnf_uncached(self, formula: str, var_to_num: Dict[str, int]) -> Tuple[List[List[int]], int]:
+        """Convert propositional formula to CNF clauses via a single tokenize/parse pass"""
+        try:
+            normalized = self._normalize_formula_syntax(formula.strip())
+            ast = _parse_formula(_tokenize_formula(normalized))
+            aux_vars = []
+            cnf = self._ast_to_cnf(ast, var_to_num, False, {}, aux_vars)
+            return [list(clause) for clause in cnf], len(aux_vars)
+        except ValueError as e:
+            # Fallback: create a tautology
+            logger.warning(f"Unknown formula pattern: {formula} ({e}), creating tautology")
+            return [[1, -1]], 0  # Always true
+    
+    def _ast_to_cnf(self, node: Tuple, var_to_num: Dict[str, int], negated: bool,
+                    memo: Dict[Tuple, Tuple[Tuple[int, ...], ...]],
+                    aux_vars: List[int]) -> Tuple[Tuple[int, ...], ...]:
+        """Post-order CNF emission; negations are pushed down to the literals (De Morgan)
         
-        for i, part in enumerate(parts):
-            part = part.strip()
-            print(f"DEBUG COMPLEX OR: Processing part {i+1}: '{part}'")
-            
-            # Remove outer parentheses if present
-            if part.startswith('(') and part.endswith(')'):
-                part = part[1:-1].strip()
-                print(f"DEBUG COMPLEX OR: Removed outer parens: '{part}'")
-            
-            # Convert this part to CNF
-            print(f"DEBUG COMPLEX OR: Converting to CNF: '{part}'")
-            part_cnf = self._formula_to_cnf(part, var_to_num)
-            print(f"DEBUG COMPLEX OR: Part CNF result: {part_cnf}")
-            cnf_parts.append(part_cnf)
-        
-        print(f"DEBUG COMPLEX OR: All CNF parts: {cnf_parts}")
-        
-        # Apply distributive law for multiple parts
-        # For (A && B) || (C && D) || E, convert to CNF using distributive expansion
-        result_cnf = []
-        
-        # Start with the first part
-        if not cnf_parts:
-            return [[1, -1]]  # Fallback
-        
-        # Initialize with first part
-        current_combinations = cnf_parts[0]
-        print(f"DEBUG COMPLEX OR: Starting with first part: {current_combinations}")
-        
-        # For each additional part, apply distributive law
-        for i in range(1, len(cnf_parts)):
-            next_part = cnf_parts[i]
-            print(f"DEBUG COMPLEX OR: Combining with part {i+1}: {next_part}")
-            
-            new_combinations = []
-            
-            # For each existing combination, combine with each clause from the next part
-            for existing_clause in current_combinations:
-                for new_clause in next_part:
-                    # Combine clauses: [A] || [C] = [A, C]
-                    combined_clause = existing_clause + new_clause
-                    new_combinations.append(combined_clause)
-                    print(f"DEBUG COMPLEX OR: Combined: {existing_clause} + {new_clause} = {combined_clause}")
-            
-            current_combinations = new_combinations
-            print(f"DEBUG COMPLEX OR: Current combinations after part {i+1}: {current_combinations}")
+        Fresh Tseitin variables allocated for large disjunctions are appended to aux_vars.
+        """
+        key = (node, negated)
+        if key in memo:
+            return memo[key]
+        
+        kind = node[0]
+        if kind == 'var':
+            num = var_to_num.get(node[1])
+            if num is None:
+                raise ValueError(f"unknown variable '{node[1]}'")
+            cnf = ((-num if negated else num),),
+        elif kind == 'not':
+            cnf = self._ast_to_cnf(node[1], var_to_num, not negated, memo, aux_vars)
+        else:
+            parts = [self._ast_to_cnf(child, var_to_num, negated, memo, aux_vars) for child in node[1]]
+            if (kind == 'and') != negated:
+                # Conjunction: concatenate the clauses of every operand
+                cnf = tuple(clause for part in parts for clause in part)
+            elif math.prod(len(part) for part in parts) <= self.TSEITIN_THRESHOLD:
+                # Small disjunction: distributive law, one clause per combination of operand clauses
+                cnf = parts[0]
+                for part in parts[1:]:
+                    cnf = tuple(existing + new for existing in cnf for new in part)
+            else:
+                cnf = self._tseitin_or(parts, len(var_to_num), aux_vars)
         
-        print(f"DEBUG COMPLEX OR: Final result CNF: {current_combinations}")
-        return current_combinations
+        memo[key] = cnf
+        return cnf
+    
+    @staticmethod
+    def _tseitin_or(parts: List[Tuple[Tuple[int, ...], ...]], num_vars: int,
+                    aux_vars: List[int]) -> Tuple[Tuple[int, ...], ...]:
+        """Encode a disjunction of CNFs with one auxiliary variable per multi-clause operand
+        
+        Each aux_i implies its operand (!aux_i || C for every clause C), and the
+        final clause requires one of the operands (single-clause operands are
+        inlined there directly). Linear in the operand sizes, equisatisfiable.
+        """
+        clauses = []
+        selector = ()
+        for part in parts:
+            if len(part) == 1:
+                selector += part[0]
+                continue
+            aux = num_vars + len(aux_vars) + 1
+            aux_vars.append(aux)
+            clauses.extend((-aux,) + clause for clause in part)
+            selector += (aux,)
+        clauses.append(selector)
+        return tuple(clauses)
     
     def _normalize_formula_syntax(self, formula: str) -> str:
         """Normalize different formula syntax variations - FIXED SPACING"""
-        import re
-        
-        # Step 1: Replace negation symbols
-        formula = formula.replace('~', '!')
-        formula = formula.replace('¬', '!')
-        
-        # Step 2: Simple character-by-character processing
-        result = []
-        i = 0
-        while i < len(formula):
-            char = formula[i]
-            
-            if char == '&':
-                # Check if next char is also &
-                if i + 1 < len(formula) and formula[i + 1] == '&':
-                    result.append(' && ')  # SPACES BEFORE AND AFTER
-                    i += 2
-                else:
-                    result.append(' && ')  # SPACES BEFORE AND AFTER
-                    i += 1
-            elif char == '|':
-                # Check if next char is also |
-                if i + 1 < len(formula) and formula[i + 1] == '|':
-                    result.append(' || ')  # SPACES BEFORE AND AFTER
-                    i += 2
-                else:
-                    result.append(' || ')  # SPACES BEFORE AND AFTER
-                    i += 1
-            elif char == '!':
-                result.append('!')
-                i += 1
-            elif char == '(' or char == ')':
-                result.append(char)
-                i += 1
-            elif char.isspace():
-                if result and result[-1] != ' ' and result[-1] not in '()':
-                    result.append(' ')
-                i += 1
-            else:
-                result.append(char)
-                i += 1
-        
-        normalized = ''.join(result)
-        
-        # Final cleanup - but preserve operator spacing
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        # CRITICAL: Ensure proper spacing around operators
-        normalized = re.sub(r'\s*&&\s*', ' && ', normalized)
-        normalized = re.sub(r'\s*\|\|\s*', ' || ', normalized)
-        
-        # Fix parentheses spacing
-        normalized = re.sub(r'\s*\(\s*', '(', normalized)
-        normalized = re.sub(r'\s*\)\s*', ')', normalized)
-        
-        # IMPORTANT: Fix patterns like )||( -> ) || (
-        normalized = re.sub(r'\)\|\|', ') ||', normalized)
-        normalized = re.sub(r'\|\|\(', '|| (', normalized)
-        
-        return normalized
+        return _normalize_formula(formula)
     
     def _parse_depqbf_output(self, stdout: str, stderr: str, returncode: int) -> QBFResult:
         """Parse DepQBF output to determine result"""
@@ -465,8 +717,107 @@ class DepQBFSolver:
         else:
             return QBFResult.ERROR
 
+class NativeQBFSolver(DepQBFSolver):
+    """DepQBF called in-process through its C library (libqdpll) instead of one process per formula
+    
+    Encoding, simplification and Bloqqer preprocessing are shared with DepQBFSolver;
+    only the final solver call differs.
+    """
+    
+    # QDPLLQuantifierType values from qdpll.h
+    QTYPE_EXISTS = -1
+    QTYPE_FORALL = 1
+    
+    def __init__(self, use_preprocessor: bool = True, library_path: str = None):
+        self.library_path = library_path
+        super().__init__(use_preprocessor)
+    
+    def _find_or_install_depqbf(self) -> Optional[str]:
+        """Load libqdpll (never installs anything); its path replaces the binary path"""
+        library_path = self.library_path or os.environ.get("DEPQBF_LIBRARY") or ctypes.util.find_library("qdpll")
+        if not library_path:
+            return None
+        try:
+            lib = ctypes.CDLL(library_path)
+        except OSError as e:
+            logger.warning(f"Could not load DepQBF library {library_path}: {e}")
+            return None
+        
+        lib.qdpll_create.restype = ctypes.c_void_p
+        lib.qdpll_create.argtypes = []
+        lib.qdpll_delete.restype = None
+        lib.qdpll_delete.argtypes = [ctypes.c_void_p]
+        lib.qdpll_adjust_vars.restype = None
+        lib.qdpll_adjust_vars.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+        lib.qdpll_new_scope.restype = ctypes.c_uint
+        lib.qdpll_new_scope.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.qdpll_add.restype = None
+        lib.qdpll_add.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.qdpll_sat.restype = ctypes.c_int
+        lib.qdpll_sat.argtypes = [ctypes.c_void_p]
+        self._lib = lib
+        logger.info(f"Found DepQBF library at: {library_path}")
+        return library_path
+    
+    def _run_depqbf(self, qdimacs_content: str,
+                    formula: Optional[QBFFormula] = None) -> Tuple[QBFResult, str, Optional[str]]:
+        """Feed the QDIMACS prefix and clauses to a fresh solver instance
+        
+        The library call can't be interrupted, so cancel() has no effect on it.
+        """
+        num_vars = 0
+        blocks = []
+        clauses = []
+        for line in qdimacs_content.split("\n"):
+            fields = line.split()
+            if not fields or fields[0] == "c":
+                continue
+            if fields[0] == "p":
+                num_vars = int(fields[2])
+            elif fields[0] in ("a", "e"):
+                blocks.append((fields[0], [int(field) for field in fields[1:-1]]))
+            else:
+                clauses.append([int(field) for field in fields])
+        
+        # Unquantified variables are outermost existentials, as in DepQBF's file reader
+        declared = {var for _, block in blocks for var in block}
+        free = [var for var in range(1, num_vars + 1) if var not in declared]
+        if free:
+            if blocks and blocks[0][0] == "e":
+                blocks[0] = ("e", free + blocks[0][1])
+            else:
+                blocks.insert(0, ("e", free))
+        
+        lib = self._lib
+        solver = lib.qdpll_create()
+        try:
+            lib.qdpll_adjust_vars(solver, num_vars)
+            for quant_symbol, block in blocks:
+                lib.qdpll_new_scope(solver, self.QTYPE_FORALL if quant_symbol == "a" else self.QTYPE_EXISTS)
+                for var in block:
+                    lib.qdpll_add(solver, var)
+                lib.qdpll_add(solver, 0)
+            # Clause lines already end with their terminating 0
+            for clause in clauses:
+                for lit in clause:
+                    lib.qdpll_add(solver, lit)
+            code = lib.qdpll_sat(solver)
+        finally:
+            lib.qdpll_delete(solver)
+        
+        return self._parse_depqbf_output("", "", code), f"libqdpll result code {code}", None
+
 class TweetyQBFSolver:
+    # Seconds a single formula may take before the bridge JVM is killed
+    BRIDGE_TIMEOUT = 60
+    # Bridge JVM flags. The class-data archive in bridge_dir is written on the first
+    # exit and maps the Tweety classes on later starts (JDK 19+; older JVMs ignore it)
+    JVM_OPTIONS = ("-XX:+UseParallelGC", "-Xshare:auto", "-XX:+IgnoreUnrecognizedVMOptions",
+                   "-XX:+AutoCreateSharedArchive")
+    
     def __init__(self, jar_path: str):
+        self._process = None
+        self._lock = threading.Lock()
         self.jar_path = Path(jar_path)
         if not self.jar_path.exists():
             raise FileNotFoundError(f"TweetyProject JAR not found: {jar_path}")
@@ -487,41 +838,50 @@ import java.io.*;
 import java.util.*;
 
 public class TweetyQBFBridge {
-    public static void main(String[] args) {
-        if (args.length < 1) {
-            System.out.println("ERROR: No input provided");
-            System.exit(1);
+    public static void main(String[] args) throws IOException {
+        // Formulas arrive on stdin, each as a line count followed by that many lines.
+        // Runs until stdin is closed; for each formula any ERROR lines are printed,
+        // then exactly one RESULT line
+        BufferedReader stdin = new BufferedReader(new InputStreamReader(System.in));
+        String header;
+        while ((header = stdin.readLine()) != null) {
+            if (header.trim().isEmpty()) {
+                continue;
+            }
+            int lineCount;
+            try {
+                lineCount = Integer.parseInt(header.trim());
+            } catch (NumberFormatException e) {
+                System.out.println("ERROR: Invalid line count: " + header);
+                System.out.println("RESULT: ERROR");
+                continue;
+            }
+            StringBuilder qbfContent = new StringBuilder();
+            for (int i = 0; i < lineCount; i++) {
+                String line = stdin.readLine();
+                if (line == null) {
+                    break;
+                }
+                qbfContent.append(line).append('\n');
+            }
+            solve(qbfContent.toString());
+            System.out.flush();
         }
-        
+    }
+    
+    private static void solve(String qbfContent) {
         try {
-            String qbfContent = args[0];
-            System.err.println("DEBUG: Processing QBF content: " + qbfContent);
-            
             File tempFile = File.createTempFile("qbf_", ".qbf");
-            System.err.println("DEBUG: Created temp file: " + tempFile.getAbsolutePath());
             
             try (FileWriter writer = new FileWriter(tempFile)) {
                 writer.write(qbfContent);
             }
-            System.err.println("DEBUG: Successfully wrote to temp file");
-            
-            // Read back the file to verify
-            try (BufferedReader reader = new BufferedReader(new FileReader(tempFile))) {
-                String line;
-                System.err.println("DEBUG: File contents:");
-                while ((line = reader.readLine()) != null) {
-                    System.err.println("DEBUG: " + line);
-                }
-            }
             
             QbfParser parser = new QbfParser();
             PlBeliefSet beliefSet = (PlBeliefSet) parser.parseBeliefBaseFromFile(tempFile.getAbsolutePath());
-            System.err.println("DEBUG: Parsed belief set, size: " + beliefSet.size());
             
             if (!beliefSet.isEmpty()) {
                 PlFormula formula = (PlFormula) beliefSet.iterator().next();
-                System.err.println("DEBUG: Got formula: " + formula.getClass().getName());
-                System.err.println("DEBUG: Formula toString: " + formula.toString());
                 
                 NaiveQbfReasoner reasoner = new NaiveQbfReasoner();
                 
@@ -535,12 +895,10 @@ public class TweetyQBFBridge {
                 
                 // Check if the formula is satisfiable
                 boolean isSatisfiable = reasoner.query(singleFormulaSet, formula);
-                System.err.println("DEBUG: Formula satisfiability: " + isSatisfiable);
                 
                 // For contradiction check, we test if adding the formula leads to inconsistency
                 Contradiction contradiction = new Contradiction();
                 boolean isInconsistent = reasoner.query(singleFormulaSet, contradiction);
-                System.err.println("DEBUG: Formula leads to contradiction: " + isInconsistent);
                 
                 // A universally quantified formula like ∀x (x ∧ ¬x) should be unsatisfiable
                 // because x ∧ ¬x is always false regardless of x's value
@@ -550,27 +908,32 @@ public class TweetyQBFBridge {
                     System.out.println("RESULT: SATISFIABLE");
                 }
             } else {
-                System.err.println("DEBUG: Belief set is empty!");
+                System.out.println("ERROR: Belief set is empty");
                 System.out.println("RESULT: ERROR");
             }
             
-            boolean deleted = tempFile.delete();
-            System.err.println("DEBUG: Temp file deleted: " + deleted);
-            
+            tempFile.delete();
         } catch (Exception e) {
-            System.err.println("ERROR: Exception occurred:");
-            e.printStackTrace(System.err);
+            System.out.println("ERROR: " + e);
             System.out.println("RESULT: ERROR");
         }
     }
 }'''
         
         bridge_file = self.bridge_dir / "TweetyQBFBridge.java"
+        class_file = self.bridge_dir / "TweetyQBFBridge.class"
+        hash_file = self.bridge_dir / "TweetyQBFBridge.java.sha256"
+        
+        # Keep the compiled bridge as long as its source is unchanged
+        code_hash = hashlib.sha256(java_code.encode()).hexdigest()
+        if class_file.exists() and hash_file.exists() and hash_file.read_text().strip() == code_hash:
+            return
+        
         with open(bridge_file, 'w') as f:
             f.write(java_code)
+        hash_file.write_text(code_hash)
         
         # Remove old class file to force recompilation
-        class_file = self.bridge_dir / "TweetyQBFBridge.class"
         if class_file.exists():
             class_file.unlink()
     
@@ -582,54 +945,106 @@ public class TweetyQBFBridge {
             ], capture_output=True, text=True)
             
             if result.returncode != 0:
-                print("COMPILATION ERROR:")
-                print("STDOUT:", result.stdout)
-                print("STDERR:", result.stderr)
+                logger.error("Bridge compilation failed:\nSTDOUT: %s\nSTDERR: %s", result.stdout, result.stderr)
             
             return result.returncode == 0
         except Exception as e:
-            print(f"Compilation exception: {e}")
+            logger.error("Bridge compilation exception: %s", e)
             return False
     
+    def _bridge_process(self) -> subprocess.Popen:
+        """The long-running bridge JVM, started on first use and restarted if it died"""
+        if self._process is None or self._process.poll() is not None:
+            cmd = [
+                "java", *self.JVM_OPTIONS,
+                f"-XX:SharedArchiveFile={self.bridge_dir / 'tweety.jsa'}",
+                "-cp", f"{self.jar_path}:{self.bridge_dir}",
+                "TweetyQBFBridge"
+            ]
+            # The bridge reports errors on stdout, so stderr can't fill up and block it
+            self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        return self._process
+    
+    def _query_bridge(self, qbf_content: str) -> List[str]:
+        """Send one formula to the bridge and return its output lines, ending with the RESULT line"""
+        with self._lock:
+            process = self._bridge_process()
+            # A hung query is killed, which makes the pending readline() return ''
+            watchdog = threading.Timer(self.BRIDGE_TIMEOUT, process.kill)
+            watchdog.start()
+            try:
+                process.stdin.write(self._frame(qbf_content))
+                process.stdin.flush()
+                lines = []
+                while True:
+                    line = process.stdout.readline()
+                    if not line:
+                        raise RuntimeError("Tweety bridge exited or timed out")
+                    lines.append(line.rstrip("\n"))
+                    if line.startswith("RESULT:"):
+                        return lines
+            except Exception:
+                # Start from a fresh JVM next time rather than reading a stale response;
+                # done under the lock, so no other query is using this bridge meanwhile
+                self._close_locked()
+                raise
+            finally:
+                watchdog.cancel()
+    
     def evaluate_qbf(self, formula: QBFFormula) -> QBFEvaluationResult:
-        import time
         start_time = time.time()
         
         try:
             bridge_class = self.bridge_dir / "TweetyQBFBridge.class"
             if not bridge_class.exists():
                 if not self._compile_bridge():
-                    return self._error_result(formula, start_time, "Compilation failed")
+                    return self._error_result(formula, time.time() - start_time, "Compilation failed")
             
             qbf_content = self._to_qbf_format(formula)
-            print(f"DEBUG: QBF content being sent to Java: {qbf_content}");
+            logger.debug("QBF content sent to Java: %s", qbf_content)
             
-            cmd = [
-                "java", "-cp", f"{self.jar_path}:{self.bridge_dir}",
-                "TweetyQBFBridge", qbf_content
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            lines = self._query_bridge(qbf_content)
             execution_time = time.time() - start_time
+            logger.debug("Java output: %s", lines)
             
-            # Print debug info
-            print(f"DEBUG: Java stdout: {result.stdout}")
-            print(f"DEBUG: Java stderr: {result.stderr}")
-            print(f"DEBUG: Return code: {result.returncode}")
-            
-            qbf_result = self._parse_output(result.stdout)
-            
+            errors = [line for line in lines if line.startswith("ERROR:")]
             return QBFEvaluationResult(
                 formula=formula,
-                result=qbf_result,
+                result=self._parse_output(lines[-1]),
                 execution_time=execution_time,
-                solver_output=result.stdout,
-                error_message=result.stderr if result.stderr else None
+                solver_output="\n".join(lines),
+                error_message="\n".join(errors) if errors else None
             )
             
         except Exception as e:
             return self._error_result(formula, time.time() - start_time, str(e))
     
+    def evaluate_qbf_batch(self, formulas: List[QBFFormula]) -> List[QBFEvaluationResult]:
+        """Evaluate several QBFs; they all go through the same warm bridge JVM"""
+        return [self.evaluate_qbf(formula) for formula in formulas]
+    
+    def close(self):
+        """Stop the bridge JVM (a new one is started on the next evaluation)"""
+        with self._lock:
+            self._close_locked()
+    
+    def _close_locked(self):
+        """close() for callers already holding self._lock"""
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            # EOF ends the bridge loop, so the JVM exits normally and can write its class-data archive
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
+    
+    def __del__(self):
+        if getattr(self, "_process", None) is not None:
+            self.close()
+    
     def _to_qbf_format(self, formula: QBFFormula) -> str:
         inner_formula = self._convert_formula_syntax(formula.formula)
         result = inner_formula
@@ -637,6 +1052,12 @@ public class TweetyQBFBridge {
             result = f"{quant_type} {var}: ({result})"
         return result
     
+    @staticmethod
+    def _frame(qbf_content: str) -> str:
+        """Bridge input for one formula: its line count, then its lines"""
+        lines = qbf_content.splitlines() or [""]
+        return f"{len(lines)}\n" + "\n".join(lines) + "\n"
+    
     def _convert_formula_syntax(self, formula: str) -> str:
         return formula.replace("&", " && ").replace("|", " || ").replace("~", "!")
     
@@ -651,12 +1072,137 @@ public class TweetyQBFBridge {
         else:
             return QBFResult.ERROR
 
+class PortfolioSolver:
+    """Runs several solvers on each formula and returns the first conclusive verdict"""
+    
+    # Races run at the same time by evaluate_qbf_batch; each needs one worker per solver
+    BATCH_SLOTS = 4
+    
+    def __init__(self, solvers: Sequence[Any]):
+        self.solvers = list(solvers)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.solvers) * self.BATCH_SLOTS)
+        # Queries still running on a solver after another solver already answered them;
+        # such a solver sits out new queries until it has caught up
+        self._stragglers: Dict[int, set] = {index: set() for index in range(len(self.solvers))}
+        self._lock = threading.Lock()
+    
+    def evaluate_qbf(self, formula: QBFFormula) -> QBFEvaluationResult:
+        with self._lock:
+            candidates = [index for index, running in self._stragglers.items() if not running]
+            futures = {self._executor.submit(self.solvers[index].evaluate_qbf, formula): index
+                       for index in candidates or [0]}
+        
+        answer = fallback = None
+        pending = set(futures)
+        while pending and answer is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result.result in (QBFResult.SATISFIABLE, QBFResult.UNSATISFIABLE):
+                    answer = result
+                    logger.debug("Portfolio answer from %s", type(self.solvers[futures[future]]).__name__)
+                    break
+                if fallback is None:
+                    # Keep the first inconclusive result in case no solver decides the formula
+                    fallback = result
+        
+        # Losing DepQBF processes are killed; other losers (the Tweety bridge, libqdpll)
+        # can't be interrupted and keep running, so remember them until they finish
+        for future in pending:
+            solver = self.solvers[futures[future]]
+            if hasattr(solver, "cancel"):
+                solver.cancel(formula)
+        with self._lock:
+            for future in pending:
+                running = self._stragglers[futures[future]]
+                running.add(future)
+                future.add_done_callback(running.discard)
+        return answer if answer is not None else fallback
+    
+    def evaluate_qbf_batch(self, formulas: List[QBFFormula]) -> List[QBFEvaluationResult]:
+        """Evaluate several QBFs, each as its own portfolio race"""
+        if len(formulas) <= 1:
+            return [self.evaluate_qbf(formula) for formula in formulas]
+        with ThreadPoolExecutor(max_workers=min(len(formulas), self.BATCH_SLOTS)) as executor:
+            return list(executor.map(self.evaluate_qbf, formulas))
+    
+    def close(self):
+        """Stop accepting work and release the subsolvers' resources"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for solver in self.solvers:
+            if hasattr(solver, "close"):
+                solver.close()
+
+# A finished Formula/Variables/Quantifiers answer (see LLMAssistant._stream_llm)
+_RE_COMPLETE_ANSWER = re.compile(r'Formula:.*\n\s*Variables:.*\n\s*Quantifiers:[^\n]*\n')
+# Header of one answer in a batched LLM response (see LLMAssistant.text_to_qbf_batch)
+_RE_ITEM_HEADER = re.compile(r'^\s*Item\s+(\d+)\s*:', re.MULTILINE)
+# One "Formula:", "Variables:" or "Quantifiers:" line of an LLM answer
+_RE_RESPONSE_FIELD = re.compile(r'^\s*(Formula|Variables|Quantifiers):(.*)', re.MULTILINE)
+# One "exists x" / "forall x" entry of a Quantifiers line
+_RE_QUANTIFIER_ITEM = re.compile(r'(exists|forall)\s*([^,]*?)\s*(?=,|$)')
+
+# Compact UTF-8 JSON for request bodies (no spaces after separators, no \uXXXX escapes)
+_JSON_BODY_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+def _json_body(data: Dict[str, Any]) -> bytes:
+    return _JSON_BODY_ENCODER.encode(data).encode('utf-8')
+
 class LLMAssistant:
-    def __init__(self, api_key: str, api_endpoint: str = "https://api.openai.com/v1/chat/completions"):
+    # Maximum number of text -> QBF conversions kept in memory
+    FORMULA_CACHE_SIZE = 4096
+    # Response used when the API call fails
+    FALLBACK_RESPONSE = "Formula: p\nVariables: p\nQuantifiers: exists p"
+    
+    def __init__(self, api_key: str, api_endpoint: str = "https://api.openai.com/v1/chat/completions",
+                 cache_path: str = None):
         self.api_key = api_key
         self.api_endpoint = api_endpoint
+        # Optional JSONL file that keeps conversions across restarts
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._formula_cache: Dict[str, Tuple[str, Tuple[str, ...], Tuple[Tuple[str, str], ...]]] = {}
+        # Serializes cache updates (and JSONL appends) when texts are converted concurrently
+        self._cache_lock = threading.Lock()
+        # Bytes of the JSONL file already loaded; other processes may append after it
+        self._cache_offset = 0
+        if self.cache_path is not None:
+            self._load_formula_cache()
+        # Fixed part of the request body; only the messages change per call
+        self._request_template = {
+            "model": "gpt-3.5-turbo",
+            "max_tokens": 800,
+            "temperature": 0.7
+        }
+        
+        # One keep-alive session, so consecutive calls reuse the TCP/TLS connection
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+        # Enough pooled connections for QBFLogicSystem.aevaluate_texts' default concurrency;
+        # rate limits and transient server errors are retried with backoff
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["POST"])
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.session.close()
     
     def text_to_qbf(self, text: str) -> QBFFormula:
+        key = self._text_key(text)
+        cached = self._formula_cache.get(key)
+        if cached is None and self.cache_path is not None:
+            # Another process sharing the cache file may have converted it meanwhile
+            self._load_formula_cache()
+            cached = self._formula_cache.get(key)
+        if cached is not None:
+            formula, variables, quantifiers = cached
+            return QBFFormula(formula, list(variables), list(quantifiers), text)
+        
         prompt = f"""
         Convert this text to a Quantified Boolean Formula (QBF):
         
@@ -673,35 +1219,138 @@ class LLMAssistant:
         Quantifiers: forall s
         """
         
-        response = self._call_llm(prompt)
-        return self._parse_qbf_response(response, text)
+        response = self._stream_llm(prompt)
+        if response is None:
+            # Failed calls are not cached, so the text is retried next time
+            return self._parse_qbf_response(self.FALLBACK_RESPONSE, text)
+        
+        qbf_formula = self._parse_qbf_response(response, text)
+        self._remember_formula(key, qbf_formula)
+        return qbf_formula
+    
+    def text_to_qbf_batch(self, texts: Sequence[str]) -> List[QBFFormula]:
+        """Convert several texts, asking the LLM for all uncached ones in a single request
+        
+        Texts missing from the combined answer are converted one by one.
+        """
+        keys = [self._text_key(text) for text in texts]
+        if self.cache_path is not None:
+            self._load_formula_cache()
+        pending = list(dict.fromkeys(key for key in keys if key not in self._formula_cache))
+        
+        if len(pending) > 1:
+            pending_texts = {key: text for key, text in zip(keys, texts)}
+            numbered = "\n".join(f"Text {i}: {pending_texts[key]}" for i, key in enumerate(pending, 1))
+            prompt = f"""
+        Convert each of these {len(pending)} texts to a Quantified Boolean Formula (QBF):
+        
+        {numbered}
+        
+        For every text, write a line "Item <number>:" and then EXACTLY this format:
+        Formula: [use &, |, ~, (, ) with simple variables like p, q, r, s]
+        Variables: [comma-separated list]
+        Quantifiers: [format: "exists p, forall q"]
+        
+        Example:
+        Item 1:
+        Formula: s & ~s
+        Variables: s
+        Quantifiers: forall s
+        """
+            response = self._call_llm(prompt, max_tokens=self._request_template["max_tokens"] * len(pending))
+            if response is not None:
+                for number, answer in self._split_items(response).items():
+                    # Malformed answers are left to the one-by-one fallback
+                    if 1 <= number <= len(pending) and "Formula:" in answer:
+                        key = pending[number - 1]
+                        self._remember_formula(key, self._parse_qbf_response(answer, pending_texts[key]))
+        
+        # Cache hits (including the batch answers) return immediately
+        return [self.text_to_qbf(text) for text in texts]
+    
+    @staticmethod
+    def _split_items(response: str) -> Dict[int, str]:
+        """Split a batch answer into the text following each "Item <n>:" header"""
+        headers = list(_RE_ITEM_HEADER.finditer(response))
+        items = {}
+        for header, following in zip(headers, headers[1:] + [None]):
+            end = following.start() if following else len(response)
+            items[int(header.group(1))] = response[header.end():end]
+        return items
+    
+    @staticmethod
+    def _text_key(text: str) -> str:
+        """Cache key of an input text; case and whitespace differences are ignored"""
+        normalized = " ".join(text.lower().split())
+        return hashlib.sha256(normalized.encode()).hexdigest()
+    
+    def _remember_formula(self, key: str, qbf_formula: QBFFormula):
+        entry = (qbf_formula.formula, tuple(qbf_formula.variables),
+                 tuple(tuple(q) for q in qbf_formula.quantifiers))
+        with self._cache_lock:
+            if len(self._formula_cache) >= self.FORMULA_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._formula_cache[next(iter(self._formula_cache))]
+            self._formula_cache[key] = entry
+            
+            if self.cache_path is not None:
+                try:
+                    self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.cache_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps({"key": key, "formula": entry[0], "variables": entry[1],
+                                            "quantifiers": entry[2]}) + "\n")
+                except OSError as e:
+                    logger.warning(f"Could not write LLM cache {self.cache_path}: {e}")
+    
+    def _load_formula_cache(self):
+        """Load conversions appended since the last call; unreadable lines are skipped
+        
+        The first call reads what previous runs saved. Later calls only read
+        the new tail, so processes sharing one cache file see each other's
+        conversions without re-reading the whole file.
+        """
+        with self._cache_lock:
+            try:
+                with open(self.cache_path, 'rb') as f:
+                    f.seek(self._cache_offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return
+            except OSError as e:
+                logger.warning(f"Could not read LLM cache {self.cache_path}: {e}")
+                return
+            
+            # A line still being written by another process is picked up next time
+            complete = data.rfind(b"\n") + 1
+            self._cache_offset += complete
+            for line in data[:complete].splitlines():
+                try:
+                    record = json.loads(line)
+                    self._formula_cache[record["key"]] = (
+                        record["formula"], tuple(record["variables"]),
+                        tuple(tuple(q) for q in record["quantifiers"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+            # Keep only the most recent entries
+            while len(self._formula_cache) > self.FORMULA_CACHE_SIZE:
+                del self._formula_cache[next(iter(self._formula_cache))]
     
     def _parse_qbf_response(self, response: str, original_text: str) -> QBFFormula:
         try:
-            lines = response.split('\n')
             formula = "p"
             variables = ["p"]
             quantifiers = [("exists", "p")]
             
-            for line in lines:
-                line = line.strip()
-                if line.startswith("Formula:"):
-                    formula = line.replace("Formula:", "").strip()
-                elif line.startswith("Variables:"):
-                    vars_str = line.replace("Variables:", "").strip()
-                    if vars_str:
-                        variables = [v.strip() for v in vars_str.split(",") if v.strip()]
-                elif line.startswith("Quantifiers:"):
-                    quant_str = line.replace("Quantifiers:", "").strip()
-                    quantifiers = []
-                    for q in quant_str.split(","):
-                        q = q.strip()
-                        if "exists" in q:
-                            var = q.replace("exists", "").strip()
-                            quantifiers.append(("exists", var))
-                        elif "forall" in q:
-                            var = q.replace("forall", "").strip()
-                            quantifiers.append(("forall", var))
+            # Single scan over the response; later lines override earlier ones
+            for field, value in _RE_RESPONSE_FIELD.findall(response):
+                value = value.strip()
+                if field == "Formula":
+                    formula = value
+                elif field == "Variables":
+                    if value:
+                        variables = [v.strip() for v in value.split(",") if v.strip()]
+                else:
+                    quantifiers = _RE_QUANTIFIER_ITEM.findall(value)
             
             if not variables:
                 variables = ["p"]
@@ -713,76 +1362,314 @@ class LLMAssistant:
         except Exception:
             return QBFFormula("p", ["p"], [("exists", "p")], original_text)
     
-    def _call_llm(self, prompt: str) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+    def _stream_llm(self, prompt: str) -> Optional[str]:
+        """Like _call_llm, but streamed and cut off as soon as the answer format is complete
         
-        data = {
-            "model": "gpt-3.5-turbo",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 800,
-            "temperature": 0.7
-        }
+        The model often keeps writing after the Quantifiers line (explanations,
+        repeated examples); those tail tokens are never waited for.
+        """
+        data = dict(self._request_template, messages=[{"role": "user", "content": prompt}], stream=True)
         
         try:
-            response = requests.post(self.api_endpoint, headers=headers, json=data, timeout=30)
+            # Leaving the with block (also on an early break) closes the response; an unfinished
+            # stream's connection is dropped rather than drained, the session's pool stays usable
+            with self.session.post(self.api_endpoint, data=_json_body(data), timeout=30, stream=True) as response:
+                response.raise_for_status()
+                parts = []
+                # Raw bytes lines: json.loads decodes UTF-8 itself, no text decoding pass needed
+                for line in response.iter_lines():
+                    # Server-sent events: 'data: {json chunk}' lines, ended by 'data: [DONE]'
+                    if not line.startswith(b"data:"):
+                        continue
+                    payload = line[len(b"data:"):].strip()
+                    if payload == b"[DONE]":
+                        break
+                    delta = json.loads(payload)["choices"][0]["delta"].get("content")
+                    if delta:
+                        parts.append(delta)
+                        if "\n" in delta and _RE_COMPLETE_ANSWER.search("".join(parts)):
+                            break
+                return "".join(parts)
+        except Exception as e:
+            logger.error(f"LLM API call failed: {e}")
+            return None
+    
+    def _call_llm(self, prompt: str, max_tokens: int = None) -> Optional[str]:
+        """Completion text for a prompt, or None if the API call failed"""
+        # Copy rather than mutate the template, so concurrent calls don't share messages
+        data = dict(self._request_template, messages=[{"role": "user", "content": prompt}])
+        if max_tokens is not None:
+            data["max_tokens"] = max_tokens
+        
+        try:
+            response = self.session.post(self.api_endpoint, data=_json_body(data), timeout=30)
             response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
+            # Parse the raw bytes; response.json() would first guess the encoding and decode
+            return json.loads(response.content)["choices"][0]["message"]["content"]
         except Exception as e:
             logger.error(f"LLM API call failed: {e}")
-            return "Formula: p\nVariables: p\nQuantifiers: exists p"
+            return None
+
+class SolverCache:
+    """Solved formulas persisted in SQLite, so results survive process restarts"""
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    
+    @staticmethod
+    def make_key(solver_name: str, formula_str: str, variables: Sequence[str],
+                 quantifiers: Sequence[Tuple[str, str]]) -> str:
+        """Hash of the canonical formula: normalized syntax, variables in sorted order"""
+        canonical = json.dumps([solver_name, _normalize_formula(formula_str), sorted(variables),
+                                [list(q) for q in quantifiers]])
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def put(self, key: str, value: Dict[str, Any]):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                               (key, json.dumps(value)))
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
 
 # Update the main QBF system to use DepQBF
 class QBFLogicSystem:
-    def __init__(self, jar_path: str, llm_api_key: str, use_depqbf: bool = True):
-        if use_depqbf:
+    # Maximum number of solved formulas kept in memory per system
+    RESULT_CACHE_SIZE = 256
+    
+    def __init__(self, jar_path: str, llm_api_key: str, use_depqbf: bool = True,
+                 llm_cache_path: str = None, solver_cache_path: str = None,
+                 use_portfolio: bool = False, decide_small: Optional[bool] = None):
+        """decide_small: evaluate small closed QBFs in-process instead of on the solver.
+        Defaults to use_depqbf, so choosing TweetyProject gets TweetyProject's verdicts;
+        pass False wherever the configured solver itself must answer (e.g. benchmarks).
+        """
+        self.decide_small = use_depqbf if decide_small is None else decide_small
+        if use_portfolio:
+            self.solver = self._build_portfolio(jar_path)
+        elif use_depqbf:
             try:
-                self.solver = DepQBFSolver()
-                logger.info("Using DepQBF solver")
-            except RuntimeError as e:
-                logger.warning(f"DepQBF not available: {e}, falling back to TweetyProject")
-                self.solver = TweetyQBFSolver(jar_path)
+                self.solver = NativeQBFSolver()
+                logger.info("Using DepQBF library")
+            except RuntimeError:
+                try:
+                    self.solver = DepQBFSolver()
+                    logger.info("Using DepQBF solver")
+                except RuntimeError as e:
+                    logger.warning(f"DepQBF not available: {e}, falling back to TweetyProject")
+                    self.solver = TweetyQBFSolver(jar_path)
         else:
             self.solver = TweetyQBFSolver(jar_path)
         
-        self.llm = LLMAssistant(llm_api_key)
+        self.llm = LLMAssistant(llm_api_key, cache_path=llm_cache_path)
+        self._result_cache: Dict[Tuple, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
+        # Optional second tier behind the in-memory cache, kept across runs
+        self.solver_cache = SolverCache(solver_cache_path) if solver_cache_path else None
+    
+    @staticmethod
+    def _build_portfolio(jar_path: str):
+        """Every solver that can be started, raced by a PortfolioSolver
+        
+        DepQBF enters once: as a binary when there is one, else through libqdpll. Both
+        run the same solver on the same encoding, so racing them would gain nothing;
+        the binary is preferred because a losing run can be killed.
+        """
+        def depqbf():
+            try:
+                return DepQBFSolver()
+            except RuntimeError:
+                return NativeQBFSolver()
+        
+        solvers = []
+        for name, factory in (("DepQBF", depqbf), ("TweetyProject", lambda: TweetyQBFSolver(jar_path))):
+            try:
+                solvers.append(factory())
+            except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+                logger.warning(f"{name} not available for the portfolio: {e}")
+        if not solvers:
+            raise RuntimeError("No QBF solver available")
+        logger.info(f"Using a portfolio of {len(solvers)} solver(s)")
+        return solvers[0] if len(solvers) == 1 else PortfolioSolver(solvers)
+    
+    def close(self):
+        """Release the HTTP session and any long-running solver process"""
+        self.llm.close()
+        if hasattr(self.solver, "close"):
+            self.solver.close()
+        if self.solver_cache is not None:
+            self.solver_cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def evaluate_text(self, text: str) -> Dict[str, Any]:
         qbf_formula = self.llm.text_to_qbf(text)
-        result = self.solver.evaluate_qbf(qbf_formula)
         
+        # The same text often yields the same QBF; share the solved-formula cache
+        key = self._cache_key(qbf_formula.formula, qbf_formula.variables, qbf_formula.quantifiers)
+        result = self._cached_result(key)
+        if result is None:
+            result = self._store_result(key, qbf_formula, self._solve(qbf_formula))
+        
+        return self._text_result(text, qbf_formula, result)
+    
+    async def aevaluate_texts(self, texts: Sequence[str], concurrency: int = 16) -> List[Dict[str, Any]]:
+        """Evaluate texts concurrently, with at most `concurrency` LLM/solver round-trips in flight
+        
+        Each evaluation runs in a worker thread, so LLM requests and solver runs of
+        different texts overlap instead of queueing behind each other.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def evaluate(text: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(self.evaluate_text, text)
+        
+        return await asyncio.gather(*(evaluate(text) for text in texts))
+    
+    def evaluate_texts_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """Convert all texts with a single LLM request, then solve the formulas as one batch"""
+        qbf_formulas = self.llm.text_to_qbf_batch(texts)
+        results = self.evaluate_qbf_batch([(f.formula, f.variables, f.quantifiers) for f in qbf_formulas])
+        return [self._text_result(text, qbf_formula, result)
+                for text, qbf_formula, result in zip(texts, qbf_formulas, results)]
+    
+    @staticmethod
+    def _text_result(text: str, qbf_formula: QBFFormula, result: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "original_text": text,
             "qbf_formula": qbf_formula.formula,
             "variables": qbf_formula.variables,
             "quantifiers": qbf_formula.quantifiers,
-            "result": result.result.value,
-            "execution_time": result.execution_time,
-            "solver_output": result.solver_output,
-            "error": result.error_message
+            "result": result["result"],
+            "execution_time": result["execution_time"],
+            "solver_output": result["solver_output"],
+            "error": result["error"]
         }
     
-    def evaluate_qbf(self, formula_str: str, variables: List[str], 
-                     quantifiers: List[Tuple[str, str]]) -> Dict[str, Any]:
-        formula = QBFFormula(formula_str, variables, quantifiers)
-        result = self.solver.evaluate_qbf(formula)
-        
-        return {
-            "formula": formula_str,
+    def evaluate_qbf(self, formula_str: str, variables: Sequence[str], 
+                     quantifiers: Sequence[Tuple[str, str]]) -> Dict[str, Any]:
+        key = self._cache_key(formula_str, variables, quantifiers)
+        cached = self._cached_result(key)
+        if cached is not None:
+            # The cached entry may come from a differently spelled, equivalent formula
+            return dict(cached, formula=formula_str)
+        
+        formula = QBFFormula(formula_str, list(variables), list(quantifiers))
+        result = self._solve(formula)
+        return self._store_result(key, formula, result)
+
+    def evaluate_qbf_batch(self, items: Sequence[Tuple[str, Sequence[str], Sequence[Tuple[str, str]]]]) -> List[Dict[str, Any]]:
+        """Evaluate several (formula, variables, quantifiers) triples in one solver call"""
+        keys = [self._cache_key(*item) for item in items]
+        resolved = {}
+        # First item of each distinct key; equivalent spellings are solved once
+        firsts = dict(zip(reversed(keys), reversed(items)))
+        for key in firsts:
+            cached = self._cached_result(key)
+            if cached is not None:
+                resolved[key] = cached
+        missing = [key for key in dict.fromkeys(keys) if key not in resolved]
+        
+        if missing:
+            formulas = [QBFFormula(formula_str, list(variables), list(quantifiers))
+                        for formula_str, variables, quantifiers in map(firsts.get, missing)]
+            results = [self._decide_small(formula) if self.decide_small else None for formula in formulas]
+            pending = [i for i, result in enumerate(results) if result is None]
+            if pending:
+                solved = self.solver.evaluate_qbf_batch([formulas[i] for i in pending])
+                for i, result in zip(pending, solved):
+                    results[i] = result
+            for key, formula, result in zip(missing, formulas, results):
+                resolved[key] = self._store_result(key, formula, result)
+        
+        return [dict(resolved[key], formula=item[0]) for key, item in zip(keys, items)]
+    
+    def _solve(self, formula: QBFFormula) -> QBFEvaluationResult:
+        """Decide small formulas in-process (unless disabled); only the rest reaches the solver"""
+        return (self.decide_small and self._decide_small(formula)) or self.solver.evaluate_qbf(formula)
+    
+    @staticmethod
+    def _decide_small(formula: QBFFormula) -> Optional[QBFEvaluationResult]:
+        start_time = time.time()
+        verdict = _decide_small_qbf(formula)
+        if verdict is None:
+            return None
+        return QBFEvaluationResult(
+            formula=formula,
+            result=verdict,
+            execution_time=time.time() - start_time,
+            solver_output="Decided by direct evaluation",
+            error_message=None
+        )
+    
+    @staticmethod
+    def _cache_key(formula_str: str, variables: Sequence[str],
+                   quantifiers: Sequence[Tuple[str, str]]) -> Tuple:
+        """Canonical (formula, free variables, prefix); the raw triple if it can't be canonicalized"""
+        canonical = _canonical_formula(formula_str, variables, quantifiers)
+        if canonical is not None:
+            return canonical
+        return (formula_str, tuple(variables), tuple(tuple(q) for q in quantifiers))
+    
+    def _store_result(self, key: Tuple, formula: QBFFormula, result: QBFEvaluationResult) -> Dict[str, Any]:
+        """Build the result dict and cache it, unless the solver failed"""
+        result_dict = {
+            "formula": formula.formula,
             "result": result.result.value,
             "execution_time": result.execution_time,
             "solver_output": result.solver_output,
             "error": result.error_message
         }
+        if result.result != QBFResult.ERROR:
+            self._remember_result(key, result_dict)
+            if self.solver_cache is not None:
+                self.solver_cache.put(self._persistent_key(key), result_dict)
+        return dict(result_dict)
+    
+    def _cached_result(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Previously solved result, from memory or else from the persistent cache"""
+        with self._cache_lock:
+            cached = self._result_cache.get(key)
+        if cached is None and self.solver_cache is not None:
+            cached = self.solver_cache.get(self._persistent_key(key))
+            if cached is not None:
+                self._remember_result(key, cached)
+        return cached
+    
+    def _remember_result(self, key: Tuple, result_dict: Dict[str, Any]):
+        with self._cache_lock:
+            if len(self._result_cache) >= self.RESULT_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._result_cache[next(iter(self._result_cache))]
+            self._result_cache[key] = result_dict
+    
+    def _persistent_key(self, key: Tuple) -> str:
+        # In-process verdicts are stored apart, so a solver-only system never reads them
+        solver_name = type(self.solver).__name__ + ("+direct" if self.decide_small else "")
+        return SolverCache.make_key(solver_name, *key)
 
 def main():
     from config import Config
     
     try:
         system = QBFLogicSystem(
-            jar_path=str(Config.JAR_PATH),
+            jar_path=Config.JAR_PATH_STR,
             llm_api_key=Config.get_api_key()
         )
         
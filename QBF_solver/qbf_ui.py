@@ -5,16 +5,22 @@ Modern interface for QBF reasoning with DepQBF and TweetyProject integration
 """
 
 import streamlit as st
+import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import sys
 from pathlib import Path
 import time
-import json
+import re
+import hashlib
+import threading
+from collections import Counter, deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
 
 try:
-    from qbf_system import QBFLogicSystem, QBFFormula
     from config import Config
 except ImportError as e:
     st.error(f"Import error: {e}")
@@ -28,8 +34,104 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+def get_system(use_depqbf: bool, decide_small: bool = True):
+    """One QBFLogicSystem per solver choice, shared by every rerun and session
+    
+    With decide_small=False every formula reaches the chosen solver (Solver Comparison).
+    TweetyProject never uses the shortcut, so all its callers share one system (one JVM).
+    """
+    return _cached_system(use_depqbf, decide_small and use_depqbf)
+
+@st.cache_resource(show_spinner=False)
+def _cached_system(use_depqbf: bool, decide_small: bool):
+    """get_system's factory, keyed on the normalized arguments
+    
+    qbf_system (requests, sqlite3, the solver wrappers) is only imported here,
+    so the page starts rendering before the solver stack is loaded.
+    """
+    from qbf_system import QBFLogicSystem
+    
+    return QBFLogicSystem(
+        jar_path=Config.JAR_PATH_STR,
+        llm_api_key=Config.get_api_key(),
+        use_depqbf=use_depqbf,
+        decide_small=decide_small
+    )
+
+class _FailedEvaluation(Exception):
+    """Carries an ERROR result out of cached_eval, so st.cache_data doesn't keep it"""
+    
+    def __init__(self, result: dict):
+        super().__init__(result.get('error'))
+        self.result = result
+
+@st.cache_data(show_spinner=False, max_entries=1024)
+def cached_eval(key: str, _solver_name: str, _formula: str, _variables: tuple, _quantifiers: tuple,
+                _decide_small: bool = True) -> dict:
+    """Solver result for a QBF, computed once per solver and reused by later reruns
+    
+    Only `key` is hashed by Streamlit (arguments starting with '_' are skipped);
+    it must identify the other arguments, see qbf_key.
+    """
+    result = get_system(_solver_name == "DepQBF", _decide_small).evaluate_qbf(_formula, list(_variables), list(_quantifiers))
+    if result['result'] == 'ERROR':
+        raise _FailedEvaluation(result)
+    return result
+
+def qbf_key(solver_name: str, formula: str, variables: tuple, quantifiers: tuple, decide_small: bool = True) -> str:
+    """128-bit digest of an evaluation's inputs"""
+    return hashlib.blake2b(repr((solver_name, formula, variables, quantifiers, decide_small)).encode(),
+                           digest_size=16).hexdigest()
+
+def evaluate(solver_name: str, formula: str, variables, quantifiers, decide_small: bool = True) -> dict:
+    """cached_eval keyed on a digest of the inputs; failed evaluations are returned, not cached"""
+    variables = tuple(variables)
+    quantifiers = tuple(tuple(q) for q in quantifiers)
+    try:
+        return cached_eval(qbf_key(solver_name, formula, variables, quantifiers, decide_small),
+                           solver_name, formula, variables, quantifiers, decide_small)
+    except _FailedEvaluation as e:
+        return e.result
+
+# Batch Analysis line 'formula | variables | quantifiers'; the formula may itself contain '|'
+BATCH_LINE_RE = re.compile(r'(?P<formula>.+)\|(?P<variables>[^|]*)\|(?P<quantifiers>[^|]*)$')
+# One 'exists x' / 'forall x' entry of the quantifiers field
+QUANTIFIER_RE = re.compile(r'(exists|forall)\s*([^,\s]+)')
+
+def thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Worker threads attached to the current script run, so they can use the st caches"""
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(max_workers=max_workers,
+                              initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx))
+
+def compare_solver(solver_name: str, test_case: dict) -> dict:
+    """One Solver Comparison cell: the solver's verdict on a test case, checked against the expected one"""
+    try:
+        result = evaluate(
+            solver_name,
+            test_case['formula'],
+            test_case['variables'],
+            test_case['quantifiers'],
+            # The comparison measures the solver itself, not the in-process shortcut
+            decide_small=False
+        )
+        
+        return {
+            'result': result['result'],
+            'time': result['execution_time'],
+            'correct': result['result'] == test_case['expected']
+        }
+        
+    except Exception as e:
+        return {
+            'result': 'ERROR',
+            'time': 0,
+            'error': str(e),
+            'correct': False
+        }
+
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
@@ -106,7 +208,116 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# HTML fragments filled in per result
+FORMULA_HTML = '<div class="formula-display">{}</div>'
+RESULT_BOX_HTML = """
+<div class="result-box {result_class}">
+    <h3>{heading}</h3>
+    {details}
+</div>
+"""
+QUANTIFIER_SYMBOLS = {'forall': '∀', 'exists': '∃'}
+
+def prefixed_formula_html(formula: str, quantifiers) -> str:
+    """Formula box showing the quantifier prefix in front of the formula"""
+    quantifier_str = " ".join([f"{QUANTIFIER_SYMBOLS.get(q, '∃')}{v}" for q, v in quantifiers])
+    return FORMULA_HTML.format(f"{quantifier_str} ({formula})")
+
+def result_box_html(result: dict, heading: str, *details: str) -> str:
+    """Colored box for a solver result; each detail becomes a paragraph"""
+    return RESULT_BOX_HTML.format(
+        result_class=result['result'].lower(),
+        heading=heading,
+        details="".join(f"<p>{detail}</p>" for detail in details)
+    )
+
+@st.cache_resource
+def load_static_cases():
+    """Solver Comparison test cases and Examples formulas, built once per process
+    
+    The script reruns on every interaction; their formula box HTML never changes.
+    """
+    # Test cases that were problematic
+    test_cases = [
+        {
+            "name": "Problematic Case 1",
+            "description": "∃y: (∀x: (x ∧ ¬y)) - Should be UNSATISFIABLE",
+            "formula": "x && !y",
+            "variables": ["x", "y"],
+            "quantifiers": [("exists", "y"), ("forall", "x")],
+            "expected": "UNSATISFIABLE"
+        },
+        {
+            "name": "Problematic Case 2", 
+            "description": "∃x: (∀y: (x ∧ ¬y)) - Should be UNSATISFIABLE",
+            "formula": "x && !y",
+            "variables": ["x", "y"],
+            "quantifiers": [("exists", "x"), ("forall", "y")],
+            "expected": "UNSATISFIABLE"
+        },
+        {
+            "name": "Simple Tautology",
+            "description": "∀x: (x ∨ ¬x) - Should be SATISFIABLE",
+            "formula": "x || !x",
+            "variables": ["x"],
+            "quantifiers": [("forall", "x")],
+            "expected": "SATISFIABLE"
+        },
+        {
+            "name": "Simple Contradiction",
+            "description": "∃x: (x ∧ ¬x) - Should be UNSATISFIABLE",
+            "formula": "x && !x",
+            "variables": ["x"],
+            "quantifiers": [("exists", "x")],
+            "expected": "UNSATISFIABLE"
+        }
+    ]
+
+    # Classic formulas shown in Examples mode
+    examples = [
+        {
+            "name": "Tautology",
+            "description": "A formula that is always true",
+            "formula": "x | ~x",
+            "variables": ["x"],
+            "quantifiers": [("forall", "x")],
+            "expected": "SATISFIABLE"
+        },
+        {
+            "name": "Contradiction",
+            "description": "A formula that is never true",
+            "formula": "x & ~x",
+            "variables": ["x"],
+            "quantifiers": [("forall", "x")],
+            "expected": "UNSATISFIABLE"
+        },
+        {
+            "name": "Existential Choice",
+            "description": "There exists a choice that works for all cases",
+            "formula": "x | y",
+            "variables": ["x", "y"],
+            "quantifiers": [("exists", "x"), ("forall", "y")],
+            "expected": "SATISFIABLE"
+        },
+        {
+            "name": "Universal Implication",
+            "description": "For all x, if x is true then x is true",
+            "formula": "~x | x",
+            "variables": ["x"],
+            "quantifiers": [("forall", "x")],
+            "expected": "SATISFIABLE"
+        }
+    ]
+    
+    for case in test_cases + examples:
+        case['formula_html'] = prefixed_formula_html(case['formula'], case['quantifiers'])
+    return test_cases, examples
+
+COMPARISON_TEST_CASES, QBF_EXAMPLES = load_static_cases()
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state with solver preference
 if 'solver_preference' not in st.session_state:
@@ -115,11 +326,7 @@ if 'solver_preference' not in st.session_state:
 if 'system' not in st.session_state or st.session_state.get('current_solver') != st.session_state.solver_preference:
     try:
         use_depqbf = st.session_state.solver_preference == "DepQBF"
-        st.session_state.system = QBFLogicSystem(
-            jar_path=str(Config.JAR_PATH),
-            llm_api_key=Config.get_api_key(),
-            use_depqbf=use_depqbf
-        )
+        st.session_state.system = get_system(use_depqbf)
         st.session_state.initialized = True
         st.session_state.current_solver = st.session_state.solver_preference
         st.session_state.init_error = None
@@ -129,19 +336,25 @@ if 'system' not in st.session_state or st.session_state.get('current_solver') !=
         # Try fallback to TweetyProject if DepQBF fails
         if st.session_state.solver_preference == "DepQBF":
             try:
-                st.session_state.system = QBFLogicSystem(
-                    jar_path=str(Config.JAR_PATH),
-                    llm_api_key=Config.get_api_key(),
-                    use_depqbf=False
-                )
+                st.session_state.system = get_system(False)
                 st.session_state.initialized = True
                 st.session_state.current_solver = "TweetyProject"
                 st.session_state.fallback_used = True
             except Exception as e2:
                 st.session_state.init_error = f"Both solvers failed: DepQBF ({e}), TweetyProject ({e2})"
 
+# Older queries are dropped from the history beyond this many entries
+HISTORY_SIZE = 1000
+
 if 'history' not in st.session_state:
-    st.session_state.history = []
+    st.session_state.history = deque(maxlen=HISTORY_SIZE)
+    # Number of queries per result, kept up to date by record() (evicted entries stay counted)
+    st.session_state.result_counts = Counter()
+
+def record(entry: dict):
+    """Append a query to the history and count its result"""
+    st.session_state.history.append(entry)
+    st.session_state.result_counts[entry['result']] += 1
 
 # Main header with solver badge
 solver_badge_class = "depqbf-badge" if st.session_state.get('current_solver') == "DepQBF" else "tweety-badge"
@@ -221,11 +434,10 @@ with st.sidebar:
     st.subheader("📈 Session Stats")
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Queries", len(st.session_state.history))
+        st.metric("Queries", sum(st.session_state.result_counts.values()))
     with col2:
         if st.session_state.history:
-            satisfiable_count = sum(1 for h in st.session_state.history if h.get('result') == 'SATISFIABLE')
-            st.metric("Satisfiable", satisfiable_count)
+            st.metric("Satisfiable", st.session_state.result_counts['SATISFIABLE'])
     
     st.markdown("---")
     
@@ -240,7 +452,8 @@ with st.sidebar:
     
     # Clear history
     if st.button("🗑️ Clear History", type="secondary"):
-        st.session_state.history = []
+        st.session_state.history = deque(maxlen=HISTORY_SIZE)
+        st.session_state.result_counts = Counter()
         st.rerun()
 
 # Main content area
@@ -248,89 +461,27 @@ if mode == "🧪 Solver Comparison":
     st.header("🧪 Solver Comparison")
     st.write("Compare results between DepQBF and TweetyProject solvers on problematic cases.")
     
-    # Test cases that were problematic
-    test_cases = [
-        {
-            "name": "Problematic Case 1",
-            "description": "∃y: (∀x: (x ∧ ¬y)) - Should be UNSATISFIABLE",
-            "formula": "x && !y",
-            "variables": ["x", "y"],
-            "quantifiers": [("exists", "y"), ("forall", "x")],
-            "expected": "UNSATISFIABLE"
-        },
-        {
-            "name": "Problematic Case 2", 
-            "description": "∃x: (∀y: (x ∧ ¬y)) - Should be UNSATISFIABLE",
-            "formula": "x && !y",
-            "variables": ["x", "y"],
-            "quantifiers": [("exists", "x"), ("forall", "y")],
-            "expected": "UNSATISFIABLE"
-        },
-        {
-            "name": "Simple Tautology",
-            "description": "∀x: (x ∨ ¬x) - Should be SATISFIABLE",
-            "formula": "x || !x",
-            "variables": ["x"],
-            "quantifiers": [("forall", "x")],
-            "expected": "SATISFIABLE"
-        },
-        {
-            "name": "Simple Contradiction",
-            "description": "∃x: (x ∧ ¬x) - Should be UNSATISFIABLE",
-            "formula": "x && !x",
-            "variables": ["x"],
-            "quantifiers": [("exists", "x")],
-            "expected": "UNSATISFIABLE"
-        }
-    ]
-    
     if st.button("🚀 Run Comparison Test", type="primary"):
         st.subheader("📊 Comparison Results")
         
-        results = []
         progress_bar = st.progress(0)
+        solver_results = [{} for _ in COMPARISON_TEST_CASES]
         
-        for i, test_case in enumerate(test_cases):
-            with st.spinner(f"Testing: {test_case['name']}"):
-                # Test with both solvers
-                solver_results = {}
-                
-                for solver_name in ["DepQBF", "TweetyProject"]:
-                    try:
-                        # Create system with specific solver
-                        use_depqbf = solver_name == "DepQBF"
-                        test_system = QBFLogicSystem(
-                            jar_path=str(Config.JAR_PATH),
-                            llm_api_key=Config.get_api_key(),
-                            use_depqbf=use_depqbf
-                        )
-                        
-                        result = test_system.evaluate_qbf(
-                            test_case['formula'],
-                            test_case['variables'],
-                            test_case['quantifiers']
-                        )
-                        
-                        solver_results[solver_name] = {
-                            'result': result['result'],
-                            'time': result['execution_time'],
-                            'correct': result['result'] == test_case['expected']
-                        }
-                        
-                    except Exception as e:
-                        solver_results[solver_name] = {
-                            'result': 'ERROR',
-                            'time': 0,
-                            'error': str(e),
-                            'correct': False
-                        }
-                
-                results.append({
-                    'test_case': test_case,
-                    'results': solver_results
-                })
-            
-            progress_bar.progress((i + 1) / len(test_cases))
+        # Every (test case, solver) pair runs concurrently; the progress bar is updated from this thread only
+        with st.spinner("Testing all cases with both solvers..."):
+            with thread_pool(max_workers=4) as executor:
+                futures = {
+                    executor.submit(compare_solver, solver_name, test_case): (i, solver_name)
+                    for i, test_case in enumerate(COMPARISON_TEST_CASES)
+                    for solver_name in ["DepQBF", "TweetyProject"]
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    i, solver_name = futures[future]
+                    solver_results[i][solver_name] = future.result()
+                    progress_bar.progress(done / len(futures))
+        
+        results = [{'test_case': test_case, 'results': case_results}
+                   for test_case, case_results in zip(COMPARISON_TEST_CASES, solver_results)]
         
         # Display results
         for i, test_result in enumerate(results):
@@ -341,9 +492,7 @@ if mode == "🧪 Solver Comparison":
             st.write(test_case['description'])
             
             # Formula display
-            quantifier_str = " ".join([f"{'∀' if q == 'forall' else '∃'}{v}" for q, v in test_case['quantifiers']])
-            full_formula = f"{quantifier_str} ({test_case['formula']})"
-            st.markdown(f'<div class="formula-display">{full_formula}</div>', unsafe_allow_html=True)
+            st.markdown(test_case['formula_html'], unsafe_allow_html=True)
             
             # Results comparison
             col1, col2, col3 = st.columns(3)
@@ -423,7 +572,7 @@ elif mode == "🗣️ Natural Language":
                 result = st.session_state.system.evaluate_text(text_input)
                 
                 # Store in history
-                st.session_state.history.append({
+                record({
                     'mode': 'Natural Language',
                     'input': text_input,
                     'result': result['result'],
@@ -440,7 +589,7 @@ elif mode == "🗣️ Natural Language":
                     
                     # Generated QBF
                     st.write("**Generated QBF Formula:**")
-                    st.markdown(f'<div class="formula-display">{result["qbf_formula"]}</div>', unsafe_allow_html=True)
+                    st.markdown(FORMULA_HTML.format(result["qbf_formula"]), unsafe_allow_html=True)
                     
                     # Variables and quantifiers
                     col_a, col_b = st.columns(2)
@@ -452,17 +601,12 @@ elif mode == "🗣️ Natural Language":
                 
                 with col2:
                     # Result display
-                    result_class = result['result'].lower()
-                    if result_class == 'error':
-                        result_class = 'error'
-                    
-                    st.markdown(f"""
-                    <div class="result-box {result_class}">
-                        <h3>Result: {result['result']}</h3>
-                        <p>Solver: {st.session_state.get('current_solver')}</p>
-                        <p>Execution: {result['execution_time']:.3f}s</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(result_box_html(
+                        result,
+                        f"Result: {result['result']}",
+                        f"Solver: {st.session_state.get('current_solver')}",
+                        f"Execution: {result['execution_time']:.3f}s"
+                    ), unsafe_allow_html=True)
                 
                 # Technical details
                 with st.expander("🔧 Technical Details"):
@@ -527,10 +671,10 @@ elif mode == "🔢 Direct QBF":
             
             with st.spinner("Evaluating with TweetyProject..."):
                 try:
-                    result = st.session_state.system.evaluate_qbf(formula, vars_list, quantifiers)
+                    result = evaluate(st.session_state.current_solver, formula, vars_list, quantifiers)
                     
                     # Store in history
-                    st.session_state.history.append({
+                    record({
                         'mode': 'Direct QBF',
                         'input': f"{formula} with {quantifiers}",
                         'result': result['result'],
@@ -543,21 +687,14 @@ elif mode == "🔢 Direct QBF":
                     
                     with col1:
                         # Formula display
-                        quantifier_str = " ".join([f"{'∀' if q == 'forall' else '∃'}{v}" for q, v in quantifiers])
-                        full_formula = f"{quantifier_str} ({formula})"
-                        st.markdown(f'<div class="formula-display">{full_formula}</div>', unsafe_allow_html=True)
+                        st.markdown(prefixed_formula_html(formula, quantifiers), unsafe_allow_html=True)
                     
                     with col2:
-                        result_class = result['result'].lower()
-                        if result_class == 'error':
-                            result_class = 'error'
-                        
-                        st.markdown(f"""
-                        <div class="result-box {result_class}">
-                            <h3>{result['result']}</h3>
-                            <p>{result['execution_time']:.3f}s</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(result_box_html(
+                            result,
+                            result['result'],
+                            f"{result['execution_time']:.3f}s"
+                        ), unsafe_allow_html=True)
                     
                     # Analysis
                     if result.get('analysis'):
@@ -571,57 +708,21 @@ elif mode == "📚 Examples":
     st.header("QBF Examples")
     st.write("Explore classic QBF formulas and their evaluations.")
     
-    examples = [
-        {
-            "name": "Tautology",
-            "description": "A formula that is always true",
-            "formula": "x | ~x",
-            "variables": ["x"],
-            "quantifiers": [("forall", "x")],
-            "expected": "SATISFIABLE"
-        },
-        {
-            "name": "Contradiction",
-            "description": "A formula that is never true",
-            "formula": "x & ~x",
-            "variables": ["x"],
-            "quantifiers": [("forall", "x")],
-            "expected": "UNSATISFIABLE"
-        },
-        {
-            "name": "Existential Choice",
-            "description": "There exists a choice that works for all cases",
-            "formula": "x | y",
-            "variables": ["x", "y"],
-            "quantifiers": [("exists", "x"), ("forall", "y")],
-            "expected": "SATISFIABLE"
-        },
-        {
-            "name": "Universal Implication",
-            "description": "For all x, if x is true then x is true",
-            "formula": "~x | x",
-            "variables": ["x"],
-            "quantifiers": [("forall", "x")],
-            "expected": "SATISFIABLE"
-        }
-    ]
-    
-    for i, example in enumerate(examples):
+    for i, example in enumerate(QBF_EXAMPLES):
         with st.expander(f"📖 {example['name']}: {example['description']}"):
             col1, col2, col3 = st.columns([2, 1, 1])
             
             with col1:
-                quantifier_str = " ".join([f"{'∀' if q == 'forall' else '∃'}{v}" for q, v in example['quantifiers']])
-                full_formula = f"{quantifier_str} ({example['formula']})"
-                st.markdown(f'<div class="formula-display">{full_formula}</div>', unsafe_allow_html=True)
+                st.markdown(example['formula_html'], unsafe_allow_html=True)
                 st.write(f"**Expected:** {example['expected']}")
             
             with col2:
                 if st.button(f"🧮 Test Example", key=f"test_{i}"):
                     with st.spinner("Evaluating..."):
                         try:
-                            result = st.session_state.system.evaluate_qbf(
-                                example['formula'], 
+                            result = evaluate(
+                                st.session_state.current_solver,
+                                example['formula'],
                                 example['variables'], 
                                 example['quantifiers']
                             )
@@ -669,66 +770,66 @@ x | y | x,y | exists x, forall y""",
             lines = [line.strip() for line in batch_input.split('\n') if line.strip()]
             
             progress_bar = st.progress(0)
-            results = []
+            jobs = {}
             
+            # Parse every line up front; only the solver calls go to the worker threads
             for i, line in enumerate(lines):
-                try:
-                    parts = [p.strip() for p in line.split('|')]
-                    if len(parts) >= 3:
-                        formula = parts[0]
-                        variables = [v.strip() for v in parts[1].split(',')]
-                        quantifiers = []
-                        
-                        quant_parts = parts[2].split(',')
-                        for qp in quant_parts:
-                            qp = qp.strip()
-                            if 'exists' in qp:
-                                var = qp.replace('exists', '').strip()
-                                quantifiers.append(('exists', var))
-                            elif 'forall' in qp:
-                                var = qp.replace('forall', '').strip()
-                                quantifiers.append(('forall', var))
-                        
-                        # Evaluate
-                        result = st.session_state.system.evaluate_qbf(formula, variables, quantifiers)
-                        results.append({
-                            'formula': formula,
-                            'result': result['result'],
-                            'time': result['execution_time'],
-                            'line': line
-                        })
-                    
-                except Exception as e:
-                    results.append({
-                        'formula': line,
-                        'result': 'ERROR',
-                        'time': 0,
-                        'error': str(e),
-                        'line': line
-                    })
-                
-                progress_bar.progress((i + 1) / len(lines))
+                match = BATCH_LINE_RE.match(line)
+                if match:
+                    variables = [v.strip() for v in match['variables'].split(',')]
+                    quantifiers = QUANTIFIER_RE.findall(match['quantifiers'])
+                    jobs[i] = (match['formula'].strip(), variables, quantifiers)
+            
+            # One row per parsed line ('formula | variables | quantifiers'; other lines are left out),
+            # filled column by column so the table is built without per-row dicts
+            row_of = {i: row for row, i in enumerate(jobs)}
+            formulas = [job[0] for job in jobs.values()]
+            row_lines = [lines[i] for i in jobs]
+            verdicts = ['ERROR'] * len(jobs)
+            times = [0.0] * len(jobs)
+            errors = [None] * len(jobs)
+            
+            done = len(lines) - len(jobs)
+            if jobs:
+                with thread_pool(max_workers=min(8, len(jobs))) as executor:
+                    futures = {
+                        executor.submit(evaluate, st.session_state.current_solver, *job): i
+                        for i, job in jobs.items()
+                    }
+                    for future in as_completed(futures):
+                        row = row_of[futures[future]]
+                        try:
+                            result = future.result()
+                            verdicts[row] = result['result']
+                            times[row] = result['execution_time']
+                        except Exception as e:
+                            formulas[row] = row_lines[row]
+                            errors[row] = str(e)
+                        done += 1
+                        progress_bar.progress(done / len(lines))
+            progress_bar.progress(1.0)
             
             # Display results
             st.subheader("📊 Batch Results")
             
-            # Summary metrics
+            # Summary metrics, counted in a single pass
+            counts = Counter(verdicts)
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Total", len(results))
+                st.metric("Total", len(verdicts))
             with col2:
-                satisfiable = sum(1 for r in results if r['result'] == 'SATISFIABLE')
-                st.metric("Satisfiable", satisfiable)
+                st.metric("Satisfiable", counts['SATISFIABLE'])
             with col3:
-                unsatisfiable = sum(1 for r in results if r['result'] == 'UNSATISFIABLE')
-                st.metric("Unsatisfiable", unsatisfiable)
+                st.metric("Unsatisfiable", counts['UNSATISFIABLE'])
             with col4:
-                errors = sum(1 for r in results if r['result'] == 'ERROR')
-                st.metric("Errors", errors)
+                st.metric("Errors", counts['ERROR'])
             
             # Results table
+            columns = {'formula': formulas, 'result': verdicts, 'time': times, 'line': row_lines}
+            if any(errors):
+                columns['error'] = errors
             st.dataframe(
-                results,
+                pd.DataFrame(columns),
                 column_config={
                     "formula": "Formula",
                     "result": "Result",
@@ -743,11 +844,12 @@ if st.session_state.history:
     st.markdown("---")
     st.header("📚 Query History")
     
-    for i, entry in enumerate(reversed(st.session_state.history[-10:])):  # Show last 10
+    total_queries = sum(st.session_state.result_counts.values())
+    for i, entry in enumerate(islice(reversed(st.session_state.history), 10)):  # Show last 10
         solver_used = entry.get('solver', 'Unknown')
         badge_class = "depqbf-badge" if solver_used == "DepQBF" else "tweety-badge"
         
-        with st.expander(f"Query {len(st.session_state.history) - i}: {entry['mode']} - {entry['result']} ({solver_used})"):
+        with st.expander(f"Query {total_queries - i}: {entry['mode']} - {entry['result']} ({solver_used})"):
             col1, col2 = st.columns([3, 1])
             with col1:
                 st.write(f"**Input:** {entry['input']}")
@@ -7,8 +7,41 @@ Quick launcher script for the web UI
 import subprocess
 import sys
 import os
+import json
+import hashlib
+import importlib.util
 from pathlib import Path
 
+from config import Config, path_exists
+from java_probe import java_available
+
+# Result of the last successful Java probe, reused until PATH or the JAR changes;
+# kept in the user's cache directory rather than next to the sources
+PROBE_CACHE = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "qbf-logic" / "probe_cache.json"
+
+def _probe_key(jar_path: Path) -> dict:
+    """Fields that invalidate the cached Java probe when they change"""
+    return {
+        "jar_mtime_ns": jar_path.stat().st_mtime_ns,
+        "path_hash": hashlib.blake2b(os.environ.get("PATH", "").encode()).hexdigest()[:16],
+    }
+
+def _cached_java_probe(key: dict) -> bool:
+    """Whether a previous launch already ran this java under the same PATH and JAR"""
+    try:
+        cached = json.loads(PROBE_CACHE.read_text())
+    except (OSError, ValueError):
+        return False
+    return cached.get("java_ok") is True and all(cached.get(k) == v for k, v in key.items())
+
+def _store_java_probe(key: dict) -> None:
+    """Remember a successful Java probe; failures are always re-checked"""
+    try:
+        PROBE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        PROBE_CACHE.write_text(json.dumps({"java_ok": True, **key}))
+    except OSError:
+        pass
+
 def check_requirements():
     """Check if all requirements are met"""
     print("🔍 Checking requirements...")
@@ -27,7 +60,7 @@ def check_requirements():
     
     # Check JAR file
     jar_path = Path("org.tweetyproject.logics.qbf-1.28-with-dependencies.jar")
-    if jar_path.exists():
+    if path_exists(jar_path):
         print("✅ TweetyProject JAR found")
     else:
         print("❌ TweetyProject JAR not found")
@@ -35,39 +68,61 @@ def check_requirements():
     
     # Check .env file
     env_path = Path(".env")
-    if env_path.exists():
+    if path_exists(env_path):
         print("✅ Environment configuration found")
     else:
         print("⚠️ .env file not found (API key required for LLM features)")
     
-    # Check Java
-    try:
-        result = subprocess.run(["java", "-version"], capture_output=True)
-        if result.returncode == 0:
-            print("✅ Java available")
-        else:
-            print("❌ Java not available")
-            return False
-    except FileNotFoundError:
+    # Check Java: a PATH lookup, plus 'java -version' only until it has succeeded once
+    _, java_path = java_available(verify=False)
+    if not java_path:
         print("❌ Java not found")
         return False
+    probe_key = {"java_path": java_path, **_probe_key(jar_path)}
+    if not _cached_java_probe(probe_key) or Config.VERIFY_JAVA:
+        java_ok, _ = java_available(verify=True)
+        if not java_ok:
+            print("❌ Java not available")
+            return False
+        _store_java_probe(probe_key)
+    print("✅ Java available")
     
     return True
 
 def install_streamlit():
     """Install streamlit if not available"""
+    # find_spec locates the package without running its (heavy) import
+    if importlib.util.find_spec("streamlit") is not None:
+        return True
+    print("📦 Installing Streamlit...")
     try:
-        import streamlit
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "streamlit", "pandas", "plotly"])
+        print("✅ Streamlit installed")
         return True
-    except ImportError:
-        print("📦 Installing Streamlit...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "streamlit", "pandas", "plotly"])
-            print("✅ Streamlit installed")
-            return True
-        except subprocess.CalledProcessError:
-            print("❌ Failed to install Streamlit")
-            return False
+    except subprocess.CalledProcessError:
+        print("❌ Failed to install Streamlit")
+        return False
+
+# Streamlit options for the UI server (passed as --flags to the CLI fallback)
+UI_OPTIONS = {
+    "server.headless": False,
+    "server.runOnSave": True,
+    "theme.base": "light",
+}
+
+def _run_streamlit_in_process():
+    """Serve the UI from this interpreter, reusing the modules already imported"""
+    from streamlit.web import bootstrap
+    # Same steps as `streamlit run`: apply the options, then start the server
+    bootstrap.load_config_options(flag_options=UI_OPTIONS)
+    bootstrap.run("qbf_ui.py", False, [], UI_OPTIONS)
+
+def _run_streamlit_subprocess():
+    """Serve the UI through the streamlit CLI in a child interpreter"""
+    flags = []
+    for name, value in UI_OPTIONS.items():
+        flags += [f"--{name}", str(value).lower()]
+    subprocess.run([sys.executable, "-m", "streamlit", "run", "qbf_ui.py", *flags])
 
 def launch_ui():
     """Launch the Streamlit UI"""
@@ -77,12 +132,11 @@ def launch_ui():
     print("=" * 50)
     
     try:
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", "qbf_ui.py",
-            "--server.headless", "false",
-            "--server.runOnSave", "true",
-            "--theme.base", "light"
-        ])
+        try:
+            _run_streamlit_in_process()
+        except ImportError:
+            # Streamlit layout without streamlit.web.bootstrap: use the CLI
+            _run_streamlit_subprocess()
     except KeyboardInterrupt:
         print("\n\n👋 QBF Logic System stopped. Goodbye!")
     except Exception as e:
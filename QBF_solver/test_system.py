@@ -3,9 +3,12 @@
 Test the QBF system with actual TweetyProject classes
 """
 
+import io
 import sys
+import contextvars
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import subprocess
 
 sys.path.append(str(Path(__file__).parent))
 
@@ -20,17 +23,16 @@ def test_basic_requirements():
         return False
     print(f"✅ JAR found: {jar_path}")
     
-    # Check Java
-    try:
-        result = subprocess.run(["java", "-version"], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ Java available")
-        else:
-            print("❌ Java not working")
-            return False
-    except FileNotFoundError:
+    # Check Java (set QBF_VERIFY_JAVA=1 to also run 'java -version')
+    from java_probe import java_available
+    java_ok, java_path = java_available()
+    if not java_path:
         print("❌ Java not found")
         return False
+    if not java_ok:
+        print("❌ Java not working")
+        return False
+    print(f"✅ Java available: {java_path}")
     
     # Check config
     try:
@@ -54,7 +56,7 @@ def test_qbf_system():
         from config import Config
         
         system = QBFLogicSystem(
-            jar_path=str(Config.JAR_PATH),
+            jar_path=Config.JAR_PATH_STR,
             llm_api_key=Config.get_api_key()
         )
         print("✅ QBF System initialized")
@@ -85,22 +87,47 @@ def test_ui_dependencies():
     """Test UI dependencies"""
     print("\n=== Testing UI Dependencies ===")
     
-    try:
-        import streamlit
-        print("✅ Streamlit available")
-    except ImportError:
+    # Only locate the packages; importing them would run their initialization
+    if importlib.util.find_spec("streamlit") is None:
         print("⚠️ Streamlit not installed (run: pip install streamlit)")
         return False
+    print("✅ Streamlit available")
     
-    try:
-        import pandas
-        print("✅ Pandas available")
-    except ImportError:
+    if importlib.util.find_spec("pandas") is None:
         print("⚠️ Pandas not installed")
         return False
+    print("✅ Pandas available")
     
     return True
 
+# Output buffer of the test running in the current thread, if any
+_test_output = contextvars.ContextVar("_test_output", default=None)
+
+class _BufferedStdout(io.TextIOBase):
+    """sys.stdout stand-in that sends each test's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def write(self, text):
+        return (_test_output.get() or self.stream).write(text)
+    
+    def flush(self):
+        (_test_output.get() or self.stream).flush()
+
+def _run_buffered(name, test_func):
+    """Run one test, returning its result and everything it printed"""
+    buffer = io.StringIO()
+    token = _test_output.set(buffer)
+    try:
+        result = test_func()
+    except Exception as e:
+        print(f"❌ {name} failed: {e}")
+        result = False
+    finally:
+        _test_output.reset(token)
+    return result, buffer.getvalue()
+
 def main():
     """Run all tests"""
     print("QBF Logic System - Test Suite")
@@ -112,16 +139,22 @@ def main():
         ("UI Dependencies", test_ui_dependencies)
     ]
     
+    # The tests are independent and mostly wait on subprocesses, so run them
+    # together; each one's output is printed in a block once it finishes
     results = {}
-    for name, test_func in tests:
-        try:
-            results[name] = test_func()
-        except KeyboardInterrupt:
-            print("\n⚠️ Interrupted")
-            break
-        except Exception as e:
-            print(f"❌ {name} failed: {e}")
-            results[name] = False
+    stdout, sys.stdout = sys.stdout, _BufferedStdout(sys.stdout)
+    executor = ThreadPoolExecutor(max_workers=len(tests))
+    try:
+        futures = {executor.submit(_run_buffered, name, test_func): name for name, test_func in tests}
+        for future in as_completed(futures):
+            results[futures[future]], output = future.result()
+            stdout.write(output)
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrupted")
+    finally:
+        sys.stdout = stdout
+        executor.shutdown(wait=False, cancel_futures=True)
+    results = {name: results[name] for name, _ in tests if name in results}
     
     # Summary
     print("\n" + "=" * 40)
@@ -0,0 +1,307 @@
+"""
+Unit tests for the pure-Python parts of qbf_system: formula normalization,
+parsing, CNF encoding and the result caches. No solver binary is needed.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from QBF_solver.qbf_system import (SMALL_QBF_VARIABLES, DepQBFSolver, QBFFormula, QBFLogicSystem,
+                                   QBFResult, SolverCache, _canonical_formula, _decide_small_qbf,
+                                   _normalize_formula, _parse_formula, _tokenize_formula, _truth_table,
+                                   _variable_columns)
+
+
+def parse(formula):
+    return _parse_formula(_tokenize_formula(_normalize_formula(formula)))
+
+def var(name):
+    return ('var', name)
+
+def evaluate_ast(node, assignment):
+    kind = node[0]
+    if kind == 'var':
+        return assignment[node[1]]
+    if kind == 'not':
+        return not evaluate_ast(node[1], assignment)
+    values = (evaluate_ast(operand, assignment) for operand in node[1])
+    return all(values) if kind == 'and' else any(values)
+
+def brute_force(formula, variables, quantifiers):
+    """Truth of a QBF by expansion; unquantified variables are outermost existentials"""
+    ast = parse(formula)
+    quantified = [v for _, v in quantifiers]
+    prefix = [('exists', v) for v in variables if v not in quantified] + list(quantifiers)
+    
+    def value(level, assignment):
+        if level == len(prefix):
+            return evaluate_ast(ast, assignment)
+        quant_type, name = prefix[level]
+        branches = (value(level + 1, {**assignment, name: bit}) for bit in (False, True))
+        return all(branches) if quant_type == 'forall' else any(branches)
+    
+    return QBFResult.SATISFIABLE if value(0, {}) else QBFResult.UNSATISFIABLE
+
+def solve_qdimacs(text):
+    """Truth of a QDIMACS problem by expansion, with DepQBF's treatment of free variables"""
+    blocks, clauses, num_vars = [], [], 0
+    for line in text.split("\n"):
+        fields = line.split()
+        if fields[0] == 'p':
+            num_vars = int(fields[2])
+        elif fields[0] in ('a', 'e'):
+            blocks.extend((fields[0], int(field)) for field in fields[1:-1])
+        else:
+            clauses.append([int(field) for field in fields[:-1]])
+    declared = {v for _, v in blocks}
+    prefix = [('e', v) for v in range(1, num_vars + 1) if v not in declared] + blocks
+    
+    def value(level, assignment):
+        if level == len(prefix):
+            return all(any(assignment[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+        quant_type, num = prefix[level]
+        branches = (value(level + 1, {**assignment, num: bit}) for bit in (False, True))
+        return all(branches) if quant_type == 'a' else any(branches)
+    
+    return QBFResult.SATISFIABLE if value(0, {}) else QBFResult.UNSATISFIABLE
+
+def random_formula(rng, names, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice(names)
+    op = rng.choice([' & ', ' | ', ' | ', 'neg'])
+    if op == 'neg':
+        return '~' + random_formula(rng, names, depth - 1)
+    operands = [random_formula(rng, names, depth - 1) for _ in range(rng.randint(2, 3))]
+    return '(' + op.join(operands) + ')'
+
+def random_qbfs(seed, count):
+    """Random formulas over a, b, c, d with random prefixes; some variables stay free"""
+    rng = random.Random(seed)
+    names = ['a', 'b', 'c', 'd']
+    for _ in range(count):
+        formula = random_formula(rng, names, 4)
+        order = rng.sample(names, len(names))
+        quantifiers = [(rng.choice(['exists', 'forall']), v) for v in order[:rng.randint(0, 4)]]
+        yield formula, names, quantifiers
+
+@pytest.fixture
+def depqbf(monkeypatch):
+    """DepQBFSolver for encoding only: no binary lookup, no preprocessor"""
+    monkeypatch.setattr(DepQBFSolver, "_find_or_install_depqbf", lambda self: "depqbf")
+    return DepQBFSolver(use_preprocessor=False)
+
+def encoded_verdict(solver, formula, variables, quantifiers):
+    qdimacs, verdict = solver._encode(QBFFormula(formula, list(variables), list(quantifiers)))
+    return verdict if verdict is not None else solve_qdimacs(qdimacs)
+
+
+# Normalization and parsing
+
+@pytest.mark.parametrize("formula, expected", [
+    ("x&y", "x && y"),
+    ("x | ~y", "x || !y"),
+    ("¬(a ∧ b) ∨ c", "!(a && b) || c"),
+    ("  a  &&\tb ", "a && b"),
+])
+def test_normalize_formula(formula, expected):
+    assert _normalize_formula(formula) == expected
+
+def test_tokenize_formula():
+    assert _tokenize_formula("!(a1 && b_2) || c") == ['!', '(', 'a1', '&&', 'b_2', ')', '||', 'c']
+
+def test_tokenize_rejects_unknown_characters():
+    with pytest.raises(ValueError):
+        _tokenize_formula("a -> b")
+
+@pytest.mark.parametrize("formula, expected", [
+    # ! binds tighter than &&, which binds tighter than ||
+    ("a | b & c", ('or', (var('a'), ('and', (var('b'), var('c')))))),
+    ("a & b | c", ('or', (('and', (var('a'), var('b'))), var('c')))),
+    ("~a & b", ('and', (('not', var('a')), var('b')))),
+    ("~(a & b)", ('not', ('and', (var('a'), var('b'))))),
+    ("(a | b) & c", ('and', (('or', (var('a'), var('b'))), var('c')))),
+    # Chains of one operator become a single n-ary node
+    ("a | b | c", ('or', (var('a'), var('b'), var('c')))),
+    ("!!a", ('not', ('not', var('a')))),
+    ("((a))", var('a')),
+])
+def test_parse_precedence_and_parentheses(formula, expected):
+    assert parse(formula) == expected
+
+@pytest.mark.parametrize("formula", ["", "a &", "| a", "(a & b", "a & b)", "a b", "()", "!"])
+def test_parse_rejects_malformed_formulas(formula):
+    with pytest.raises(ValueError):
+        parse(formula)
+
+
+# CNF encoding
+
+def test_small_disjunctions_are_distributed(depqbf):
+    var_to_num = {'a': 1, 'b': 2, 'c': 3}
+    aux_vars = []
+    cnf = depqbf._ast_to_cnf(parse("a | b & c"), var_to_num, False, {}, aux_vars)
+    assert set(cnf) == {(1, 2), (1, 3)}
+    assert aux_vars == []
+
+def test_negations_are_pushed_to_the_literals(depqbf):
+    cnf = depqbf._ast_to_cnf(parse("~(a | ~b)"), {'a': 1, 'b': 2}, False, {}, [])
+    assert set(cnf) == {(-1,), (2,)}
+
+def test_tseitin_or_inlines_single_clause_operands():
+    aux_vars = []
+    clauses = DepQBFSolver._tseitin_or([((1,),), ((2,), (3,))], 3, aux_vars)
+    assert aux_vars == [4]
+    assert set(clauses) == {(-4, 2), (-4, 3), (1, 4)}
+
+def test_large_disjunctions_use_tseitin_variables(depqbf, monkeypatch):
+    monkeypatch.setattr(DepQBFSolver, "TSEITIN_THRESHOLD", 1)
+    clauses, num_aux = depqbf._formula_to_cnf("(a & b) | (c & d)", {'a': 1, 'b': 2, 'c': 3, 'd': 4})
+    assert num_aux == 2
+    assert len(clauses) == 5
+
+@pytest.mark.parametrize("threshold", [1, DepQBFSolver.TSEITIN_THRESHOLD])
+def test_encoding_matches_brute_force(depqbf, monkeypatch, threshold):
+    monkeypatch.setattr(DepQBFSolver, "TSEITIN_THRESHOLD", threshold)
+    for formula, variables, quantifiers in random_qbfs(threshold, 150):
+        assert encoded_verdict(depqbf, formula, variables, quantifiers) == \
+            brute_force(formula, variables, quantifiers), (formula, quantifiers)
+
+@pytest.mark.parametrize("formula, quantifiers, expected", [
+    ("x | y", [("forall", "x"), ("forall", "y")], QBFResult.UNSATISFIABLE),
+    ("x & y", [("forall", "x"), ("exists", "y")], QBFResult.UNSATISFIABLE),
+    ("x | ~x", [("forall", "x")], QBFResult.SATISFIABLE),
+])
+def test_simplification_decides_without_a_solver(depqbf, formula, quantifiers, expected):
+    _, verdict = depqbf._encode(QBFFormula(formula, ["x", "y"], quantifiers))
+    assert verdict == expected
+
+def test_universal_reduction():
+    forall_x_exists_y = [("forall", 1), ("exists", 2)]
+    # x is quantified outside y, so it stays; inside y it is removed
+    assert DepQBFSolver._simplify_clauses([[1, 2]], forall_x_exists_y) == [[1, 2]]
+    assert DepQBFSolver._simplify_clauses([[1, 2]], [("exists", 2), ("forall", 1)]) == [[2]]
+    # Purely universal clauses become empty; free variables count as outermost existentials
+    assert DepQBFSolver._simplify_clauses([[1]], forall_x_exists_y) == [[]]
+    assert DepQBFSolver._simplify_clauses([[1, 3]], forall_x_exists_y) == [[3]]
+
+def test_tautologies_and_duplicate_literals_are_dropped():
+    quantified = [("exists", 1), ("exists", 2)]
+    assert DepQBFSolver._simplify_clauses([[1, -1, 2], [2, 1, 2]], quantified) == [[2, 1]]
+
+
+# Truth-table decisions
+
+def test_truth_table_has_one_bit_per_assignment():
+    names = ['a', 'b', 'c']
+    full = (1 << 8) - 1
+    table = _truth_table(parse("a & ~b | c"), dict(zip(names, _variable_columns(3))), full)
+    for index, bits in enumerate(itertools.product([False, True], repeat=3)):
+        # Bit i of column k is bit k of the assignment number i
+        assignment = dict(zip(names, reversed(bits)))
+        assert bool(table >> index & 1) == evaluate_ast(parse("a & ~b | c"), assignment)
+
+def test_small_qbf_decisions_match_brute_force():
+    decided = 0
+    for formula, variables, quantifiers in random_qbfs(17, 300):
+        verdict = _decide_small_qbf(QBFFormula(formula, variables, quantifiers))
+        # None (formulas with free variables) is checked below
+        if verdict is not None:
+            decided += 1
+            assert verdict == brute_force(formula, variables, quantifiers), (formula, quantifiers)
+    assert decided > 50
+
+@pytest.mark.parametrize("formula, variables, quantifiers", [
+    ("x | y", ["x", "y"], [("forall", "x")]),                     # free variable
+    ("x | ~x", [], [("forall", "x")]),                             # undeclared variable
+    ("x | ~x", ["x"], [("forall", "x"), ("exists", "x")]),         # quantified twice
+    ("x &", ["x"], [("forall", "x")]),                             # doesn't parse
+])
+def test_small_qbf_leaves_irregular_formulas_to_the_solver(formula, variables, quantifiers):
+    assert _decide_small_qbf(QBFFormula(formula, variables, quantifiers)) is None
+
+def test_small_qbf_variable_limit():
+    names = [f"v{i}" for i in range(SMALL_QBF_VARIABLES + 1)]
+    quantifiers = [("exists", name) for name in names]
+    assert _decide_small_qbf(QBFFormula(" | ".join(names[:-1]), names, quantifiers)) == QBFResult.SATISFIABLE
+    assert _decide_small_qbf(QBFFormula(" | ".join(names), names, quantifiers)) is None
+
+def test_unused_quantifiers_do_not_count():
+    formula = QBFFormula("x", ["x", "y"], [("forall", "y"), ("exists", "x")])
+    assert _decide_small_qbf(formula) == QBFResult.SATISFIABLE
+
+
+# Cache keys
+
+@pytest.mark.parametrize("formula", ["x | ~x", "~x || x", "¬x ∨ x", "!!x | !x", "(x) | (!x | x)"])
+def test_equivalent_spellings_share_a_key(formula):
+    assert _canonical_formula(formula, ["x"], [("forall", "x")]) == \
+        _canonical_formula("x | ~x", ["x"], [("forall", "x")])
+
+def test_unicode_connectives_are_canonicalized():
+    assert _canonical_formula("¬y ∨ y", ["y"], [("forall", "y")]) == \
+        _canonical_formula("x | ~x", ["x"], [("forall", "x")])
+    assert _canonical_formula("a ∧ ¬b", ["a", "b"], [("exists", "a"), ("exists", "b")]) == \
+        _canonical_formula("!b && a", ["a", "b"], [("exists", "a"), ("exists", "b")])
+
+def test_quantified_variables_are_renamed_by_prefix_position():
+    assert _canonical_formula("a & b", ["a", "b"], [("forall", "a"), ("exists", "b")]) == \
+        _canonical_formula("p & q", ["p", "q"], [("forall", "p"), ("exists", "q")])
+
+@pytest.mark.parametrize("other", [
+    # Different quantifier, negation, operator or free variable
+    ("x & y", ["x", "y"], [("exists", "x"), ("exists", "y")]),
+    ("x & ~y", ["x", "y"], [("forall", "x"), ("exists", "y")]),
+    ("x | y", ["x", "y"], [("forall", "x"), ("exists", "y")]),
+    ("x & z", ["x", "z"], [("forall", "x")]),
+])
+def test_different_qbfs_do_not_collide(other):
+    assert _canonical_formula(*other) != \
+        _canonical_formula("x & y", ["x", "y"], [("forall", "x"), ("exists", "y")])
+
+def test_prefix_order_is_part_of_the_key():
+    assert _canonical_formula("x | ~y", ["x", "y"], [("forall", "x"), ("exists", "y")]) != \
+        _canonical_formula("x | ~y", ["x", "y"], [("forall", "y"), ("exists", "x")])
+
+def test_free_variables_keep_their_names():
+    assert _canonical_formula("x & y", ["x", "y"], [("forall", "x")]) != \
+        _canonical_formula("x & z", ["x", "z"], [("forall", "x")])
+
+@pytest.mark.parametrize("formula, variables, quantifiers", [
+    ("x &", ["x"], [("forall", "x")]),
+    ("x | ~x", [], [("forall", "x")]),
+    ("x | y", ["x"], [("forall", "x")]),
+])
+def test_unparsable_or_undeclared_formulas_have_no_canonical_key(formula, variables, quantifiers):
+    assert _canonical_formula(formula, variables, quantifiers) is None
+
+def test_uncanonical_formulas_fall_back_to_the_raw_triple():
+    key = QBFLogicSystem._cache_key("x | y", ["x"], [("forall", "x")])
+    assert key == ("x | y", ("x",), (("forall", "x"),))
+    assert key != QBFLogicSystem._cache_key("x | y", ["x", "y"], [("forall", "x")])
+
+
+# Persistent solver cache
+
+def test_solver_cache_keys_depend_on_solver_and_prefix():
+    key = SolverCache.make_key("DepQBFSolver", "x | ~x", ["x"], [("forall", "x")])
+    assert key == SolverCache.make_key("DepQBFSolver", "x||!x", ["x"], [("forall", "x")])
+    assert key != SolverCache.make_key("TweetyQBFSolver", "x | ~x", ["x"], [("forall", "x")])
+    assert key != SolverCache.make_key("DepQBFSolver", "x | ~x", ["x"], [("exists", "x")])
+
+def test_solver_cache_persists_and_overwrites(tmp_path):
+    path = tmp_path / "cache" / "results.sqlite"
+    key = SolverCache.make_key("DepQBFSolver", "x", ["x"], [("exists", "x")])
+    
+    cache = SolverCache(str(path))
+    assert cache.get(key) is None
+    cache.put(key, {"result": "SATISFIABLE"})
+    cache.put(key, {"result": "UNSATISFIABLE"})
+    cache.close()
+    
+    reopened = SolverCache(str(path))
+    try:
+        assert reopened.get(key) == {"result": "UNSATISFIABLE"}
+    finally:
+        reopened.close()
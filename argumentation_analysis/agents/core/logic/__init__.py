@@ -11,13 +11,22 @@ Il fournit également une factory pour créer les agents appropriés et des util
 pour gérer les ensembles de croyances et exécuter des requêtes logiques.
 """
 
-from .abstract_logic_agent import AbstractLogicAgent
-from .propositional_logic_agent import PropositionalLogicAgent
-from .first_order_logic_agent import FirstOrderLogicAgent
-from .modal_logic_agent import ModalLogicAgent
-from .logic_factory import LogicAgentFactory
-from .belief_set import BeliefSet, PropositionalBeliefSet, FirstOrderBeliefSet, ModalBeliefSet
-from .query_executor import QueryExecutor
+import importlib
+
+# Les modules des agents chargent semantic_kernel et la JVM : ils ne sont
+# importés qu'au premier accès à l'un de leurs noms (PEP 562).
+_LAZY_IMPORTS = {
+    'AbstractLogicAgent': 'abstract_logic_agent',
+    'PropositionalLogicAgent': 'propositional_logic_agent',
+    'FirstOrderLogicAgent': 'first_order_logic_agent',
+    'ModalLogicAgent': 'modal_logic_agent',
+    'LogicAgentFactory': 'logic_factory',
+    'BeliefSet': 'belief_set',
+    'PropositionalBeliefSet': 'belief_set',
+    'FirstOrderBeliefSet': 'belief_set',
+    'ModalBeliefSet': 'belief_set',
+    'QueryExecutor': 'query_executor',
+}
 
 __all__ = [
     'AbstractLogicAgent',
@@ -30,4 +39,17 @@ __all__ = [
     'FirstOrderBeliefSet',
     'ModalBeliefSet',
     'QueryExecutor'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
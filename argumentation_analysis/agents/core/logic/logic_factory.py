@@ -5,6 +5,9 @@ Factory pour créer les agents logiques appropriés.
 """
 
 import logging
+import sys
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Optional, Any, Type
 
 from semantic_kernel import Kernel
@@ -17,6 +20,15 @@ from .modal_logic_agent import ModalLogicAgent
 # Configuration du logger
 logger = logging.getLogger("Orchestration.LogicAgentFactory")
 
+@lru_cache(maxsize=128)
+def _normalize_logic_type(logic_type: str) -> str:
+    """Normalise un nom de type de logique (casse et espaces ignorés).
+
+    Le résultat est interné, comme les clés littérales de `_agent_classes`,
+    pour que les recherches dans les dictionnaires se résolvent par identité.
+    """
+    return sys.intern(logic_type.lower().strip())
+
 class LogicAgentFactory:
     """
     Factory pour créer les agents logiques appropriés.
@@ -32,6 +44,19 @@ class LogicAgentFactory:
         "modal": ModalLogicAgent
     }
     
+    # Abréviations acceptées, résolues vers le type canonique
+    _TYPE_ALIASES = MappingProxyType({
+        "pl": "propositional",
+        "fol": "first_order",
+        "ml": "modal"
+    })
+    
+    @classmethod
+    def _resolve_logic_type(cls, logic_type: str) -> str:
+        """Normalise `logic_type` et remplace une abréviation par le type canonique."""
+        normalized = _normalize_logic_type(logic_type)
+        return cls._TYPE_ALIASES.get(normalized, normalized)
+    
     @classmethod
     def create_agent(cls, logic_type: str, kernel: Kernel, llm_service: Optional[Any] = None) -> Optional[BaseLogicAgent]:
         """
@@ -41,7 +66,8 @@ class LogicAgentFactory:
         avec le `kernel` fourni, et configure ses composants avec `llm_service` si présent.
 
         :param logic_type: Le type de logique pour lequel créer l'agent
-                           (par exemple, "propositional", "first_order", "modal").
+                           (par exemple, "propositional", "first_order", "modal",
+                           ou leurs abréviations "pl", "fol", "ml").
                            La casse est ignorée et les espaces sont supprimés.
         :type logic_type: str
         :param kernel: L'instance du `semantic_kernel.Kernel` à passer à l'agent.
@@ -56,19 +82,19 @@ class LogicAgentFactory:
         logger.info(f"Création d'un agent logique de type '{logic_type}'")
         logger.info(f"DEBUG: Logic type received: {logic_type}")
         
-        # Normaliser le type de logique
-        logic_type = logic_type.lower().strip()
+        # Normaliser le type de logique et résoudre les abréviations
+        logic_type = cls._resolve_logic_type(logic_type)
         logger.info(f"DEBUG: Normalized logic type: {logic_type}")
         
         # Vérifier si le type de logique est supporté
-        if logic_type not in cls._agent_classes:
+        agent_class = cls._agent_classes.get(logic_type)
+        if agent_class is None:
             logger.error(f"Type de logique non supporté: {logic_type}")
             logger.info(f"Types supportés: {', '.join(cls._agent_classes.keys())}")
             return None
         
         try:
             # Créer l'instance de l'agent
-            agent_class = cls._agent_classes[logic_type]
             agent = agent_class(kernel=kernel, agent_name=f"{logic_type.capitalize()}Agent")
             
             # Configurer le kernel de l'agent si un service LLM est fourni
@@ -99,7 +125,19 @@ class LogicAgentFactory:
         :rtype: None
         """
         logger.info(f"Enregistrement de la classe d'agent '{agent_class.__name__}' pour le type de logique '{logic_type}'")
-        cls._agent_classes[logic_type.lower().strip()] = agent_class
+        cls._agent_classes[_normalize_logic_type(logic_type)] = agent_class
+    
+    @classmethod
+    def is_logic_type_supported(cls, logic_type: str) -> bool:
+        """
+        Indique si la factory sait créer un agent pour le type de logique donné.
+
+        :param logic_type: Le type de logique ou une de ses abréviations.
+        :type logic_type: str
+        :return: True si une classe d'agent est enregistrée pour ce type.
+        :rtype: bool
+        """
+        return cls._resolve_logic_type(logic_type) in cls._agent_classes
     
     @classmethod
     def get_supported_logic_types(cls) -> List[str]:
@@ -24,6 +24,16 @@ class ModalHandler:
             logger.error("Modal Logic Parser not initialized. Ensure TweetyBridge calls TweetyInitializer first.")
             raise RuntimeError("ModalHandler initialized before TweetyInitializer completed Modal Logic setup.")
 
+        # Java classes resolved by this handler (each JClass call crosses the JNI boundary)
+        self._jclasses = {}
+
+    def _jclass(self, name: str):
+        """Resolves a Java class once per handler, i.e. once per bridge and JVM."""
+        jclass = self._jclasses.get(name)
+        if jclass is None:
+            jclass = self._jclasses[name] = jpype.JClass(name)
+        return jclass
+
     def parse_modal_formula(self, formula_str: str, modal_logic_str: str = "S4", signature_declarations_str: str = None):
         """
         Parses a Modal Logic formula string into a TweetyProject MlFormula object.
@@ -76,7 +86,7 @@ class ModalHandler:
 
         logger.debug(f"Checking Modal Logic consistency for KB: '{knowledge_base_str}' (Logic: {modal_logic_str})")
         try:
-            MlBeliefSet = jpype.JClass("org.tweetyproject.logics.ml.syntax.MlBeliefSet")
+            MlBeliefSet = self._jclass("org.tweetyproject.logics.ml.syntax.MlBeliefSet")
             # ModalLogic = jpype.JClass("org.tweetyproject.logics.ml.syntax.ModalLogic") # Incorrect
             
             # Supposons que MlBeliefSet attend une chaîne pour le type de logique, ou que le parser s'en charge.
@@ -141,7 +151,7 @@ class ModalHandler:
 
         logger.debug(f"Performing Modal Logic query. KB: '{knowledge_base_str}', Query: '{query_formula_str}', Logic: {modal_logic_str}")
         try:
-            MlBeliefSet = jpype.JClass("org.tweetyproject.logics.ml.syntax.MlBeliefSet")
+            MlBeliefSet = self._jclass("org.tweetyproject.logics.ml.syntax.MlBeliefSet")
             # ModalLogic = jpype.JClass("org.tweetyproject.logics.ml.syntax.ModalLogic") # Incorrect
 
             # Comme pour modal_check_consistency, utilisons le constructeur par défaut pour MlBeliefSet.
@@ -1,7 +1,10 @@
 import jpype
 from jpype.types import JString
 import logging
-from typing import Optional, List
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Tuple
 # La configuration du logging (appel à setup_logging()) est supposée être faite globalement,
 # par exemple au point d'entrée de l'application ou dans conftest.py pour les tests.
 from argumentation_analysis.utils.core_utils.logging_utils import setup_logging
@@ -11,12 +14,46 @@ from .tweety_initializer import TweetyInitializer
 setup_logging() # Appel de la configuration globale du logging
 logger = logging.getLogger(__name__) # Obtient le logger pour ce module
 
+# Classes Java de la logique propositionnelle, résolues une seule fois par
+# TweetyInitializer (chaque JClass traverse la frontière JNI) puis partagées par
+# tous les PLHandler créés à partir de celui-ci.
+_PL_CLASS_NAMES = {
+    "PlSignature": "org.tweetyproject.logics.pl.syntax.PlSignature",
+    "Proposition": "org.tweetyproject.logics.pl.syntax.Proposition",
+    "PlBeliefSet": "org.tweetyproject.logics.pl.syntax.PlBeliefSet",
+    "Contradiction": "org.tweetyproject.logics.pl.syntax.Contradiction",
+}
+_pl_classes_lock = threading.Lock()
+
+# Opérateurs (avec leurs espaces) séparant les noms de propositions dans _normalize_formula
+_OPERATORS_RE = re.compile(r'(\s*=>\s*|\s*<=>\s*|\s*\||\s*&\s*|\s*!\s*|\(|\))')
+
+def _resolve_pl_classes(initializer_instance: TweetyInitializer) -> Dict[str, Any]:
+    """
+    Returns the PL JClass wrappers of an initializer, resolving them on first use (JVM must be started).
+    Cached on the initializer rather than per process, so a new bridge (or a test patching
+    jpype.JClass) gets classes resolved against its own JVM.
+    """
+    pl_classes = vars(initializer_instance).get("_pl_classes")
+    if pl_classes is None:
+        with _pl_classes_lock:
+            pl_classes = vars(initializer_instance).get("_pl_classes")
+            if pl_classes is None:
+                pl_classes = {name: jpype.JClass(fqn) for name, fqn in _PL_CLASS_NAMES.items()}
+                initializer_instance._pl_classes = pl_classes
+    return pl_classes
+
 class PLHandler:
     """
     Handles Propositional Logic (PL) operations using TweetyProject.
     Relies on TweetyInitializer for JVM and PL component setup.
     """
 
+    # Parsed formulas kept per handler, keyed by normalized text and constants
+    FORMULA_CACHE_SIZE = 4096
+    # Belief sets built from knowledge-base strings, reused by every query on the same KB
+    BELIEF_SET_CACHE_SIZE = 256
+
     def __init__(self, initializer_instance: TweetyInitializer):
         self._initializer_instance = initializer_instance
         self._pl_parser = self._initializer_instance.get_pl_parser()
@@ -26,9 +63,22 @@ class PLHandler:
             logger.error("PL components not initialized. Ensure TweetyBridge calls TweetyInitializer first.")
             raise RuntimeError("PLHandler initialized before TweetyInitializer completed PL setup.")
 
-    def _normalize_formula(self, formula_str: str) -> str:
+        pl_classes = _resolve_pl_classes(self._initializer_instance)
+        self._PlSignature = pl_classes["PlSignature"]
+        self._Proposition = pl_classes["Proposition"]
+        self._PlBeliefSet = pl_classes["PlBeliefSet"]
+        self._Contradiction = pl_classes["Contradiction"]
+
+        self._formula_cache: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+        self._belief_set_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[Any, int]] = {}
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_formula(formula_str: str) -> str:
         """
         Normalizes a formula string to be compatible with Tweety's parser.
+        Pure function of its input, memoized since the same formulas recur across queries.
         - Replaces logical operators (&&, ||, !, ->, <->).
         - Removes spaces within predicates, e.g., 'Coupable(Colonel Moutarde)' -> 'Coupable(ColonelMoutarde)'.
         - Ensures consistent spacing around operators.
@@ -36,7 +86,7 @@ class PLHandler:
         if not isinstance(formula_str, str):
             return ""
             
-        logger.debug(f"Normalizing formula: '{formula_str}'")
+        logger.debug("Normalizing formula: '%s'", formula_str)
         
         # Replace logical operator variations
         replacements = {
@@ -52,24 +102,16 @@ class PLHandler:
             formula_str = formula_str.replace(old, new)
 
         # Remove spaces inside predicates like `Coupable(Colonel Moutarde)`
-        import re
-        
-        # This function will be applied to each match of the regex.
-        # It replaces spaces with underscores inside the matched group.
-        def replace_spaces_with_underscores(match):
-            return match.group(0).replace(' ', '_')
-
         # A more robust approach: split by operators, process, then rejoin.
         # This avoids complex regex lookarounds.
-        operators_pattern = r'(\s*=>\s*|\s*<=>\s*|\s*\||\s*&\s*|\s*!\s*|\(|\))'
-        parts = re.split(operators_pattern, formula_str)
+        parts = _OPERATORS_RE.split(formula_str)
         
         processed_parts = []
         for part in parts:
             if part is None:
                 continue
             # Check if the part is an operator (with potential whitespace)
-            if re.fullmatch(operators_pattern, part):
+            if _OPERATORS_RE.fullmatch(part):
                 # Keep operator as is, but without surrounding spaces that will be added later
                 processed_parts.append(part.strip())
             else:
@@ -100,7 +142,7 @@ class PLHandler:
 
         formula_str = " ".join(final_formula.split()) # Clean up extra spaces
 
-        logger.debug(f"Normalized formula to: '{formula_str}'")
+        logger.debug("Normalized formula to: '%s'", formula_str)
         return formula_str
 
     def parse_pl_formula(self, formula_str: str, constants: Optional[List[str]] = None):
@@ -124,19 +166,21 @@ class PLHandler:
             formula_str.startswith('```') or
             formula_str.endswith('```') or
             '```' in formula_str):
-            logger.debug(f"Skipping parsing of invalid/markdown formula: '{formula_str}'")
+            logger.debug("Skipping parsing of invalid/markdown formula: '%s'", formula_str)
             return None
 
         normalized_formula = self._normalize_formula(formula_str)
-        logger.debug(f"Attempting to parse normalized PL formula: {normalized_formula}")
+        cache_key = (normalized_formula, tuple(constants) if constants else ())
+        pl_formula = self._formula_cache.get(cache_key)
+        if pl_formula is not None:
+            return pl_formula
+        logger.debug("Attempting to parse normalized PL formula: %s", normalized_formula)
 
         try:
             if constants:
-                PlSignature = jpype.JClass("org.tweetyproject.logics.pl.syntax.PlSignature")
-                signature = PlSignature()
-                Proposition = jpype.JClass("org.tweetyproject.logics.pl.syntax.Proposition")
+                signature = self._PlSignature()
                 for const_name in constants:
-                    proposition = Proposition(JString(const_name))
+                    proposition = self._Proposition(JString(const_name))
                     if not signature.contains(proposition):
                         signature.add(proposition)
                 pl_formula = self._pl_parser.parseFormula(JString(normalized_formula), signature)
@@ -144,7 +188,12 @@ class PLHandler:
                 java_formula_str = JString(normalized_formula)
                 pl_formula = self._pl_parser.parseFormula(java_formula_str)
 
-            logger.info(f"Successfully parsed PL formula: '{formula_str}' as '{normalized_formula}' -> {pl_formula}")
+            logger.info("Successfully parsed PL formula: '%s' as '%s' -> %s", formula_str, normalized_formula, pl_formula)
+            with self._cache_lock:
+                if len(self._formula_cache) >= self.FORMULA_CACHE_SIZE:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    del self._formula_cache[next(iter(self._formula_cache))]
+                self._formula_cache[cache_key] = pl_formula
             return pl_formula
         except jpype.JException as e:
             logger.error(f"JPype JException parsing PL formula '{formula_str}' (normalized to '{normalized_formula}'): {e.getMessage()}", exc_info=True)
@@ -153,57 +202,73 @@ class PLHandler:
             logger.error(f"Unexpected error parsing PL formula '{formula_str}' (normalized to '{normalized_formula}'): {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _formula_lines(knowledge_base_str: str) -> List[str]:
+        """Formula strings of a knowledge base: one per non-empty line, trailing '%' removed."""
+        lines = []
+        for line in knowledge_base_str.splitlines():
+            line = line.strip()
+            if line and line != '```':
+                # Remove trailing '%' if present, as it was a previous workaround
+                line = line.rstrip('%').strip()
+                if line:
+                    lines.append(line)
+        return lines
+
+    def _build_belief_set(self, knowledge_base_str: str, constants: Optional[List[str]] = None) -> Tuple[Any, int]:
+        """
+        Parses a knowledge base into a PlBeliefSet, once per distinct (KB, constants);
+        later queries on the same KB reuse it and only parse their query formula.
+        Returns the belief set and the number of formula lines of the KB, so callers
+        can tell an empty KB apart without splitting it again.
+        """
+        cache_key = (knowledge_base_str, tuple(constants) if constants else ())
+        entry = self._belief_set_cache.get(cache_key)
+        if entry is None:
+            kb = self._PlBeliefSet()
+            lines = self._formula_lines(knowledge_base_str)
+            for f_str in lines:
+                parsed_formula = self.parse_pl_formula(f_str, constants)
+                if parsed_formula:
+                    kb.add(parsed_formula)
+            entry = (kb, len(lines))
+            with self._cache_lock:
+                if len(self._belief_set_cache) >= self.BELIEF_SET_CACHE_SIZE:
+                    del self._belief_set_cache[next(iter(self._belief_set_cache))]
+                self._belief_set_cache[cache_key] = entry
+        return entry
+
     def pl_check_consistency(self, knowledge_base_str: str, constants: Optional[List[str]] = None) -> bool:
         """
         Checks if a PL knowledge base (string of formulas, semicolon-separated) is consistent.
         """
-        logger.debug(f"Checking PL consistency for: {knowledge_base_str}")
+        logger.debug("Checking PL consistency for: %s", knowledge_base_str)
         try:
-            # Parse the knowledge base string into a PlBeliefSet
-            # Tweety's PlParser can parse a belief set directly if formulas are separated by ';'
-            # However, it's often safer to parse individual formulas and add them to a knowledge base.
-            # For simplicity here, assuming parseBeliefSet handles it or we adapt.
-            
-            # Let's refine this: parse individual formulas and add to a PlBeliefSet
-            formulas = []
-            # Handle potential empty strings or formulas correctly
-            formula_strings = [f.strip() for f in knowledge_base_str.split('\n') if f.strip() and f.strip() != '```']
-            
-            if not formula_strings:
+            kb, num_formulas = self._build_belief_set(knowledge_base_str, constants)
+            if not num_formulas:
                 logger.info("Empty knowledge base is considered consistent.")
                 return True
-
-            PlBeliefSet = jpype.JClass("org.tweetyproject.logics.pl.syntax.PlBeliefSet")
-            kb = PlBeliefSet()
-
-            for f_str in formula_strings:
-                # Remove trailing '%' if present, as it was a previous workaround
-                cleaned_f_str = f_str.rstrip('%').strip()
-                if cleaned_f_str:
-                    parsed_formula = self.parse_pl_formula(cleaned_f_str, constants)
-                    if parsed_formula:
-                        kb.add(parsed_formula)
             
-            logger.info(f"DEBUG: Méthodes disponibles pour _pl_reasoner: {dir(self._pl_reasoner)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Méthodes disponibles pour _pl_reasoner: %s", dir(self._pl_reasoner))
             
             # Contournement pour le bug JPype avec isConsistent.
             # Une KB est cohérente si elle n'entraîne pas de contradiction (false).
             # On vérifie donc si la KB entraîne la formule "false".
             try:
-                Contradiction = jpype.JClass("org.tweetyproject.logics.pl.syntax.Contradiction")
-                parsed_false = Contradiction()
+                parsed_false = self._Contradiction()
                 
                 # self._pl_reasoner.query(kb, formula) retourne true si kb |= formula
                 entails_contradiction = self._pl_reasoner.query(kb, parsed_false)
                 is_consistent = not entails_contradiction
-                logger.info(f"Vérification de cohérence via query(kb, false). Entraîne contradiction: {entails_contradiction}. Cohérent: {is_consistent}")
+                logger.info("Vérification de cohérence via query(kb, false). Entraîne contradiction: %s. Cohérent: %s", entails_contradiction, is_consistent)
 
             except Exception as query_exc:
                 logger.error(f"Erreur durant le contournement de isConsistent avec query(false): {query_exc}", exc_info=True)
                 # Fallback ou lever une exception ? Pour l'instant, on lève.
                 raise RuntimeError("Échec de la vérification de cohérence alternative.") from query_exc
 
-            logger.info(f"PL Knowledge base consistency for '{knowledge_base_str}': {is_consistent}")
+            logger.info("PL Knowledge base consistency for '%s': %s", knowledge_base_str, is_consistent)
             return bool(is_consistent)
         except ValueError as e: # Catch parsing errors from parse_pl_formula
             logger.error(f"Error parsing formula in knowledge base for consistency check: {e}", exc_info=True)
@@ -221,32 +286,23 @@ class PLHandler:
         Knowledge base: string of formulas, semicolon-separated.
         Query: single formula string.
         """
-        logger.debug(f"Performing PL query. KB: '{knowledge_base_str}', Query: '{query_formula_str}'")
+        logger.debug("Performing PL query. KB: '%s', Query: '%s'", knowledge_base_str, query_formula_str)
         try:
-            PlBeliefSet = jpype.JClass("org.tweetyproject.logics.pl.syntax.PlBeliefSet")
-            kb = PlBeliefSet()
-
-            formula_strings = [f.strip() for f in knowledge_base_str.split('\n') if f.strip() and f.strip() != '```']
-            for f_str in formula_strings:
-                cleaned_f_str = f_str.rstrip('%').strip()
-                if cleaned_f_str:
-                    parsed_formula = self.parse_pl_formula(cleaned_f_str, constants)
-                    if parsed_formula:
-                        kb.add(parsed_formula)
+            kb, _ = self._build_belief_set(knowledge_base_str, constants)
             
             # Nettoyer également la chaîne de la requête
             cleaned_query_str = query_formula_str.rstrip('%').strip()
             if not cleaned_query_str or cleaned_query_str == '```':
-                logger.warning(f"Query string is invalid or empty after cleaning: '{query_formula_str}'")
+                logger.warning("Query string is invalid or empty after cleaning: '%s'", query_formula_str)
                 return False # Ou une autre gestion d'erreur appropriée
 
             query_formula = self.parse_pl_formula(cleaned_query_str, constants)
             if not query_formula:
-                logger.warning(f"Skipping empty or invalid query after parsing: '{cleaned_query_str}'")
+                logger.warning("Skipping empty or invalid query after parsing: '%s'", cleaned_query_str)
                 return False
             
             entails = self._pl_reasoner.query(kb, query_formula)
-            logger.info(f"PL Query: KB entails '{query_formula_str}'? {entails}")
+            logger.info("PL Query: KB entails '%s'? %s", query_formula_str, entails)
             return bool(entails)
         except ValueError as e: # Catch parsing errors
             logger.error(f"Error parsing formula for PL query: {e}", exc_info=True)
@@ -11,6 +11,7 @@ texte-vers-PL, la génération de requêtes et l'interprétation des résultats.
 """
 
 import logging
+import re
 from typing import Dict, List, Optional, Any, Tuple
 
 from semantic_kernel import Kernel
@@ -37,6 +38,13 @@ from ..pl.pl_definitions import PL_AGENT_INSTRUCTIONS
 # Configuration du logger
 logger = logging.getLogger(__name__) 
 
+# Une requête exploitable contient au moins une lettre (un nom de proposition)
+_QUERY_OK = re.compile(r'[A-Za-z]')
+
+def _is_candidate_query(query: str) -> bool:
+    """Écarte sans passer par la JVM les requêtes vides, les commentaires (`%`) et les lignes sans lettre."""
+    return bool(query) and not query.startswith('%') and _QUERY_OK.search(query) is not None
+
 class PropositionalLogicAgent(BaseLogicAgent): 
     """
     Agent spécialisé pour la logique propositionnelle (PL).
@@ -215,7 +223,7 @@ class PropositionalLogicAgent(BaseLogicAgent):
                  Retourne une liste vide en cas d'erreur.
         :rtype: List[str]
         """
-        self.logger.info(f"Génération de requêtes PL pour le texte : '{text[:100]}...'") 
+        self.logger.info("Génération de requêtes PL pour le texte : '%s...'", text[:100]) 
         
         try:
             arguments = KernelArguments(input=text, belief_set=belief_set.content) 
@@ -226,7 +234,11 @@ class PropositionalLogicAgent(BaseLogicAgent):
             )
             queries_text = str(result) 
             
-            queries = [q.strip() for q in queries_text.split('\n') if q.strip()]
+            # Le LLM répète souvent une même requête : les doublons sont écartés
+            # (dans l'ordre d'apparition) avant la validation par Tweety, de même
+            # que les lignes vides, les commentaires et les lignes sans proposition.
+            queries = list(dict.fromkeys(q for q in map(str.strip, queries_text.split('\n'))
+                                         if _is_candidate_query(q)))
             
             valid_queries = []
             for query in queries:
@@ -234,9 +246,9 @@ class PropositionalLogicAgent(BaseLogicAgent):
                 if self.validate_formula(query):
                     valid_queries.append(query)
                 else:
-                    self.logger.warning(f"Requête invalide générée et ignorée: {query}") 
+                    self.logger.warning("Requête invalide générée et ignorée: %s", query) 
             
-            self.logger.info(f"Génération de {len(valid_queries)} requêtes PL valides.") 
+            self.logger.info("Génération de %d requêtes PL valides.", len(valid_queries)) 
             return valid_queries
         
         except Exception as e:
@@ -259,11 +271,18 @@ class PropositionalLogicAgent(BaseLogicAgent):
                  de `TweetyBridge` (ou un message d'erreur).
         :rtype: Tuple[Optional[bool], str]
         """
-        self.logger.info(f"Exécution de la requête PL: '{query}' sur le BeliefSet.") 
-        
+        self.logger.info("Exécution de la requête PL: '%s' sur le BeliefSet.", query)
+
+        # Une requête vide, un commentaire ou une ligne sans proposition est invalide :
+        # inutile de passer par la JVM pour le constater
+        if not query or not _is_candidate_query(query.strip()):
+            msg = f"Requête invalide: {query!r}. Raison: requête vide ou sans proposition"
+            self.logger.error(msg)
+            return False, f"FUNC_ERROR: {msg}"
+
         try:
             bs_str = belief_set.content
-            
+
             is_valid, validation_message = self._tweety_bridge.validate_formula(formula_string=query)
             if not is_valid:
                 msg = f"Requête invalide: {query}. Raison: {validation_message}"
@@ -284,11 +303,11 @@ class PropositionalLogicAgent(BaseLogicAgent):
                 parsed_result_bool = False
             # Gérer les cas où is_entailed pourrait être None si TweetyBridge peut retourner cela
             elif is_entailed is None and "Unknown" in raw_output_str: # Ou un autre indicateur de raw_output
-                 self.logger.warning(f"Résultat de la requête '{query}' est 'Unknown' ou indéterminé. Output: {raw_output_str}")
+                 self.logger.warning("Résultat de la requête '%s' est 'Unknown' ou indéterminé. Output: %s", query, raw_output_str)
             else: # Fallback si is_entailed est None et pas "Unknown"
-                self.logger.warning(f"Format de sortie de TweetyBridge non reconnu ou résultat indéterminé pour '{query}': {raw_output_str}. is_entailed: {is_entailed}")
+                self.logger.warning("Format de sortie de TweetyBridge non reconnu ou résultat indéterminé pour '%s': %s. is_entailed: %s", query, raw_output_str, is_entailed)
 
-            self.logger.info(f"Résultat de l'exécution pour '{query}': {parsed_result_bool}, Output brut: '{raw_output_str}'")
+            self.logger.info("Résultat de l'exécution pour '%s': %s, Output brut: '%s'", query, parsed_result_bool, raw_output_str)
             return parsed_result_bool, raw_output_str
         
         except Exception as e:
@@ -360,11 +379,11 @@ class PropositionalLogicAgent(BaseLogicAgent):
         :return: `True` si la formule est syntaxiquement valide, `False` sinon.
         :rtype: bool
         """
-        self.logger.debug(f"Validation de la formule PL: '{formula}'")
+        self.logger.debug("Validation de la formule PL: '%s'", formula)
         try:
             is_valid, message = self._tweety_bridge.validate_formula(formula_string=formula)
             if not is_valid:
-                self.logger.warning(f"Formule PL invalide: '{formula}'. Message: {message}")
+                self.logger.warning("Formule PL invalide: '%s'. Message: %s", formula, message)
             return is_valid
         except Exception as e:
             self.logger.error(f"Erreur lors de la validation de la formule PL '{formula}': {e}", exc_info=True)
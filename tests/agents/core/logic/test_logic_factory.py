@@ -180,4 +180,39 @@ class TestLogicAgentFactory:
             
             assert "propositional" in types
             assert "first_order" in types
-            assert "modal" in types
\ No newline at end of file
+            assert "modal" in types
+
+    @pytest.mark.parametrize("logic_type", [
+        "propositional", "first_order", "modal",
+        "PROPOSITIONAL", "  Modal  ", "First_Order\t",
+    ])
+    def test_is_logic_type_supported(self, logic_type):
+        """Test des types supportés, casse et espaces ignorés."""
+        assert LogicAgentFactory.is_logic_type_supported(logic_type)
+
+    @pytest.mark.parametrize("alias, canonical", [
+        ("pl", "propositional"),
+        ("fol", "first_order"),
+        ("ml", "modal"),
+        (" PL ", "propositional"),
+        ("Fol", "first_order"),
+    ])
+    def test_type_aliases(self, alias, canonical):
+        """Test de la résolution des abréviations vers le type canonique."""
+        assert LogicAgentFactory._resolve_logic_type(alias) == canonical
+        assert LogicAgentFactory.is_logic_type_supported(alias)
+
+    @pytest.mark.parametrize("logic_type", ["unsupported", "", "p l", "propositional_logic", "aliases"])
+    def test_is_logic_type_supported_unknown_types(self, logic_type):
+        """Test des types inconnus."""
+        assert not LogicAgentFactory.is_logic_type_supported(logic_type)
+
+    @pytest.mark.asyncio
+    async def test_create_agent_with_alias(self):
+        """Test de la création d'un agent à partir d'une abréviation."""
+        await self.async_setUp()
+        with self.agent_classes_patch:
+            agent = LogicAgentFactory.create_agent(" FOL ", self.kernel)
+
+            self.mock_first_order_agent_class.assert_called_once_with(kernel=self.kernel, agent_name='First_orderAgent')
+            assert agent == self.mock_first_order_agent
\ No newline at end of file